@@ -0,0 +1,37 @@
+"""Колонка version_id для оптимистичных блокировок
+
+Revision ID: 5b7e2a9c4d13
+Revises: 8c1f4b2d9e7a
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5b7e2a9c4d13"
+down_revision = "8c1f4b2d9e7a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ("charityproject", "donation"):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    "version_id",
+                    sa.Integer(),
+                    server_default=sa.text("1"),
+                    nullable=False,
+                )
+            )
+
+
+def downgrade():
+    for table_name in ("donation", "charityproject"):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column("version_id")
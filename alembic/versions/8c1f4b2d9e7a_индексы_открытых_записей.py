@@ -0,0 +1,50 @@
+"""Индексы открытых записей и donation.user_id
+
+Revision ID: 8c1f4b2d9e7a
+Revises: 3216021f69c2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8c1f4b2d9e7a"
+down_revision = "3216021f69c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("charityproject", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_charityproject_open_create_date",
+            ["fully_invested", "create_date"],
+            unique=False,
+            sqlite_where=sa.text("fully_invested IS 0"),
+            postgresql_where=sa.text("fully_invested IS false"),
+        )
+
+    with op.batch_alter_table("donation", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_donation_open_create_date",
+            ["fully_invested", "create_date"],
+            unique=False,
+            sqlite_where=sa.text("fully_invested IS 0"),
+            postgresql_where=sa.text("fully_invested IS false"),
+        )
+        batch_op.create_index(
+            batch_op.f("ix_donation_user_id"), ["user_id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("donation", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_donation_user_id"))
+        batch_op.drop_index("ix_donation_open_create_date")
+
+    with op.batch_alter_table("charityproject", schema=None) as batch_op:
+        batch_op.drop_index("ix_charityproject_open_create_date")
@@ -0,0 +1,57 @@
+"""Журнал переводов пожертвований в проекты
+
+Revision ID: a3d9c7e1f042
+Revises: 5b7e2a9c4d13
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a3d9c7e1f042"
+down_revision = "5b7e2a9c4d13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "allocation",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("donation_id", sa.Integer(), nullable=False),
+        sa.Column("charity_project_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["charity_project_id"],
+            ["charityproject.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["donation_id"],
+            ["donation.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("allocation", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_allocation_charity_project_id"),
+            ["charity_project_id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_allocation_donation_id"),
+            ["donation_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("allocation", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_allocation_donation_id"))
+        batch_op.drop_index(batch_op.f("ix_allocation_charity_project_id"))
+
+    op.drop_table("allocation")
@@ -0,0 +1,30 @@
+"""Отметка активности фоновых задач
+
+Revision ID: b8e3f1a7c260
+Revises: f2a6d8b4c915
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "b8e3f1a7c260"
+down_revision = "f2a6d8b4c915"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.drop_column("heartbeat_at")
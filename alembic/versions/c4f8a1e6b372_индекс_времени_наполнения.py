@@ -0,0 +1,40 @@
+"""Индекс закрытых проектов по времени наполнения
+
+Revision ID: c4f8a1e6b372
+Revises: e71b5c3a9d28
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.models.base import SecondsBetween
+
+
+# revision identifiers, used by Alembic.
+revision = "c4f8a1e6b372"
+down_revision = "e71b5c3a9d28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("charityproject", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_charityproject_closed_fill_seconds",
+            [
+                SecondsBetween(
+                    sa.column("create_date", sa.DateTime(timezone=True)),
+                    sa.column("close_date", sa.DateTime(timezone=True)),
+                )
+            ],
+            unique=False,
+            sqlite_where=sa.text("fully_invested IS 1"),
+            postgresql_where=sa.text("fully_invested IS true"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("charityproject", schema=None) as batch_op:
+        batch_op.drop_index("ix_charityproject_closed_fill_seconds")
@@ -0,0 +1,107 @@
+"""Сводные показатели фонда
+
+Revision ID: e71b5c3a9d28
+Revises: a3d9c7e1f042
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.models.base import SecondsBetween
+
+
+# revision identifiers, used by Alembic.
+revision = "e71b5c3a9d28"
+down_revision = "a3d9c7e1f042"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "fund_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("total_raised", sa.Integer(), nullable=False),
+        sa.Column("total_invested", sa.Integer(), nullable=False),
+        sa.Column("donations_count", sa.Integer(), nullable=False),
+        sa.Column("projects_count", sa.Integer(), nullable=False),
+        sa.Column("open_projects", sa.Integer(), nullable=False),
+        sa.Column("closed_projects", sa.Integer(), nullable=False),
+        sa.Column("fill_seconds", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    donation = sa.table(
+        "donation",
+        sa.column("id", sa.Integer),
+        sa.column("full_amount", sa.Integer),
+        sa.column("invested_amount", sa.Integer),
+    )
+    charityproject = sa.table(
+        "charityproject",
+        sa.column("id", sa.Integer),
+        sa.column("fully_invested", sa.Boolean),
+        sa.column("create_date", sa.DateTime(timezone=True)),
+        sa.column("close_date", sa.DateTime),
+    )
+    closed = charityproject.c.fully_invested.is_(True)
+    fund_stats = sa.table(
+        "fund_stats",
+        *(
+            sa.column(name)
+            for name in (
+                "id",
+                "total_raised",
+                "total_invested",
+                "donations_count",
+                "projects_count",
+                "open_projects",
+                "closed_projects",
+                "fill_seconds",
+            )
+        ),
+    )
+    op.execute(
+        fund_stats.insert().from_select(
+            [column.name for column in fund_stats.columns],
+            sa.select(
+                sa.literal(1),
+                sa.select(
+                    sa.func.coalesce(sa.func.sum(donation.c.full_amount), 0)
+                ).scalar_subquery(),
+                sa.select(
+                    sa.func.coalesce(
+                        sa.func.sum(donation.c.invested_amount), 0
+                    )
+                ).scalar_subquery(),
+                sa.select(sa.func.count(donation.c.id)).scalar_subquery(),
+                sa.select(
+                    sa.func.count(charityproject.c.id)
+                ).scalar_subquery(),
+                sa.select(sa.func.count(charityproject.c.id))
+                .where(sa.not_(closed))
+                .scalar_subquery(),
+                sa.select(sa.func.count(charityproject.c.id))
+                .where(closed)
+                .scalar_subquery(),
+                sa.select(
+                    sa.func.coalesce(
+                        sa.func.sum(
+                            SecondsBetween(
+                                charityproject.c.create_date,
+                                charityproject.c.close_date,
+                            )
+                        ),
+                        0,
+                    )
+                )
+                .where(closed)
+                .scalar_subquery(),
+            ),
+        )
+    )
+
+
+def downgrade():
+    op.drop_table("fund_stats")
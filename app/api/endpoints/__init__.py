@@ -1,3 +1,6 @@
 from .charity_project import router as charity_project_router  # noqa
 from .donation import router as donation_router  # noqa
+from .job import router as job_router  # noqa
+from .metrics import router as metrics_router  # noqa
+from .stats import router as stats_router  # noqa
 from .user import router as user_router  # noqa
@@ -1,29 +1,51 @@
-from typing import List
+from typing import List, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import (
+    KeysetParams,
+    LIMIT_QUERY,
+    PageParams,
+    set_next_page_link,
+)
 from app.api.validators import (
     check_charity_project_exists,
     check_name_duplicate,
+    check_names_duplicate,
     forbid_delete_invested_project,
     forbid_update_closed_project,
     validate_full_amount_not_less_than_invested,
 )
+from app.core.config import settings
 from app.core.db import get_async_session
-from app.core.user import current_superuser
+from app.core.user import current_superuser, superuser_readonly
+from app.crud.allocation import allocation_crud
 from app.crud.charity_project import charity_project_crud
-from app.crud.donation import donation_crud
+from app.models import CharityProject
+from app.schemas.allocation import AllocationDB
 from app.schemas.charity_project import (
     CharityProjectCreate,
     CharityProjectDB,
+    CharityProjectFillTime,
     CharityProjectUpdate,
 )
+from app.schemas.job import JobDB
+from app.services.allocation_worker import allocation_worker
+from app.services.bulk import create_projects, publish_import
+from app.services.export import ExportFormat, MEDIA_TYPES, stream_export
+from app.services.fund_stats import apply_stats_delta, StatsDelta
 from app.services.invested import (
     close_if_fully_invested,
-    get_open_donations,
-    invest_funds,
+    invest_with_retry,
+    run_with_retry,
+    SourceUpdate,
 )
+from app.services.jobs import job_runner, JobKind
+from app.services.open_queue import open_queues, OpenEntry
+from app.services.project_cache import project_list_cache
+from app.services.reports import fastest_projects_query
 
 
 router = APIRouter()
@@ -40,19 +62,46 @@ async def create_new_charity_project(
 ) -> CharityProjectDB:
     """Создать новый проект (только для суперпользователей)."""
     await check_name_duplicate(charity_project.name, session)
+    if settings.allocation_worker_enabled:
+        return await allocation_worker.submit(
+            CharityProject, charity_project.dict()
+        )
+
+    async def prepare() -> CharityProject:
+        return await charity_project_crud.create(
+            charity_project, session, commit=False
+        )
+
+    return await invest_with_retry(prepare, session)
 
-    new_project = await charity_project_crud.create(
-        charity_project, session, commit=False
+
+@router.post(
+    "/bulk",
+    response_model=List[CharityProjectDB],
+    dependencies=[Depends(current_superuser)],
+)
+async def create_charity_projects_bulk(
+    charity_projects: List[CharityProjectCreate],
+    session: AsyncSession = Depends(get_async_session),
+) -> List[CharityProjectDB]:
+    """Создать несколько проектов сразу (только для суперпользователей)."""
+    await check_names_duplicate(
+        [charity_project.name for charity_project in charity_projects],
+        session,
     )
 
-    open_donations = await get_open_donations(session)
-    if open_donations:
-        invest_funds(new_project, open_donations)
-        session.add_all(open_donations + [new_project])
-    await session.commit()
-    await session.refresh(new_project)
+    async def operation() -> Tuple[
+        List[CharityProjectDB], List[OpenEntry], List[SourceUpdate]
+    ]:
+        projects, updates = await create_projects(charity_projects, session)
+        created = [CharityProjectDB.from_orm(project) for project in projects]
+        entries = [OpenEntry.from_obj(project) for project in projects]
+        await session.commit()
+        return created, entries, updates
 
-    return new_project
+    created, entries, updates = await run_with_retry(operation, session)
+    await publish_import(CharityProject, updates, entries)
+    return created
 
 
 @router.patch(
@@ -66,31 +115,28 @@ async def update_charity_project(
     session: AsyncSession = Depends(get_async_session),
 ) -> CharityProjectDB:
     """Обновить данные проекта (только для суперпользователей)."""
-    db_project = await check_charity_project_exists(project_id, session)
-    await forbid_update_closed_project(db_project)
-
-    if update_data.name is not None and update_data.name != db_project.name:
-        await check_name_duplicate(update_data.name, session)
 
-    await validate_full_amount_not_less_than_invested(
-        update_data.full_amount, db_project, session
-    )
-
-    updated_project = await charity_project_crud.update(
-        db_project, update_data, session, commit=False
-    )
+    async def prepare() -> CharityProject:
+        db_project = await check_charity_project_exists(project_id, session)
+        await forbid_update_closed_project(db_project)
 
-    close_if_fully_invested(updated_project)
+        if (
+            update_data.name is not None and
+            update_data.name != db_project.name
+        ):
+            await check_name_duplicate(update_data.name, session)
 
-    open_donations = await donation_crud.get_not_fully_invested(session)
+        await validate_full_amount_not_less_than_invested(
+            update_data.full_amount, db_project, session
+        )
 
-    if open_donations:
-        changed_donations = invest_funds(updated_project, open_donations)
-        session.add_all([updated_project] + changed_donations)
-    await session.commit()
-    await session.refresh(updated_project)
+        updated_project = await charity_project_crud.update(
+            db_project, update_data, session, commit=False
+        )
+        close_if_fully_invested(updated_project)
+        return updated_project
 
-    return updated_project
+    return await invest_with_retry(prepare, session)
 
 
 @router.get(
@@ -98,10 +144,91 @@ async def update_charity_project(
     response_model=List[CharityProjectDB],
 )
 async def get_all_charity_projects(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
     session: AsyncSession = Depends(get_async_session),
 ) -> List[CharityProjectDB]:
-    """Получить список всех проектов."""
-    return await charity_project_crud.get_multi(session)
+    """Получить список проектов постранично."""
+    if not settings.project_list_cache_enabled:
+        projects = await charity_project_crud.get_multi(
+            session, **page.as_filters()
+        )
+        set_next_page_link(request, response, projects, page.limit)
+        return projects
+    key = page.as_query()
+    version = await project_list_cache.version()
+    cached_page = await project_list_cache.get(key, version)
+    if cached_page is None:
+        projects = await charity_project_crud.get_multi(
+            session, **page.as_filters()
+        )
+        set_next_page_link(request, response, projects, page.limit, key)
+        cached_page = await project_list_cache.set(
+            key,
+            [CharityProjectDB.from_orm(project) for project in projects],
+            response.headers.get("Link"),
+            version,
+        )
+    return cached_page.to_response(request.headers.get("If-None-Match"))
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(superuser_readonly)],
+    response_class=StreamingResponse,
+)
+async def export_charity_projects(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session: AsyncSession = Depends(get_async_session),
+) -> StreamingResponse:
+    """Выгрузить все проекты в NDJSON или CSV потоком."""
+    return StreamingResponse(
+        stream_export(
+            [
+                CharityProject.id,
+                CharityProject.name,
+                CharityProject.description,
+                CharityProject.full_amount,
+                CharityProject.invested_amount,
+                CharityProject.fully_invested,
+                CharityProject.create_date,
+                CharityProject.close_date,
+            ],
+            export_format,
+            session,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+    )
+
+
+@router.get(
+    "/reports/fastest",
+    response_model=List[CharityProjectFillTime],
+)
+async def get_fastest_charity_projects(
+    limit: int = LIMIT_QUERY,
+    session: AsyncSession = Depends(get_async_session),
+) -> List[CharityProjectFillTime]:
+    """Закрытые проекты по возрастанию времени наполнения."""
+    result = await session.execute(fastest_projects_query().limit(limit))
+    return result.all()
+
+
+@router.post(
+    "/reports/fastest/export",
+    response_model=JobDB,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(current_superuser)],
+)
+async def start_fastest_charity_projects_export(
+    session: AsyncSession = Depends(get_async_session),
+) -> JobDB:
+    """Запустить выгрузку отчёта в CSV-файл (для суперпользователей).
+
+    Состояние выгрузки — GET /jobs/{id}, файл — GET /jobs/{id}/file.
+    """
+    return await job_runner.submit(JobKind.fastest_projects_report, session)
 
 
 @router.delete(
@@ -116,4 +243,31 @@ async def delete_charity_project(
     db_project = await check_charity_project_exists(project_id, session)
     await forbid_delete_invested_project(db_project)
     await forbid_update_closed_project(db_project)
-    return await charity_project_crud.remove(db_project, session)
+    await apply_stats_delta(
+        StatsDelta(projects_count=-1, open_projects=-1), session
+    )
+    removed_project = await charity_project_crud.remove(db_project, session)
+    open_queues[CharityProject].discard(removed_project.id)
+    await project_list_cache.invalidate()
+    return removed_project
+
+
+@router.get(
+    "/{project_id}/allocations",
+    response_model=List[AllocationDB],
+    dependencies=[Depends(superuser_readonly)],
+)
+async def get_charity_project_allocations(
+    project_id: int,
+    request: Request,
+    response: Response,
+    page: KeysetParams = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+) -> List[AllocationDB]:
+    """Получить переводы пожертвований в проект (для суперпользователей)."""
+    await check_charity_project_exists(project_id, session)
+    allocations = await allocation_crud.get_multi(
+        session, charity_project_id=project_id, **page.as_filters()
+    )
+    set_next_page_link(request, response, allocations, page.limit)
+    return allocations
@@ -1,12 +1,34 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import PositiveInt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import KeysetParams, PageParams, set_next_page_link
+from app.api.validators import check_donation_access, parse_bulk_request
+from app.core.config import settings
 from app.core.db import get_async_session
-from app.core.user import current_superuser, current_user
+from app.core.user import current_superuser, current_user, superuser_readonly
+from app.crud.allocation import allocation_crud
 from app.crud.donation import donation_crud
-from app.models import User
-from app.schemas.donation import DonationCreate, DonationDB, DonationRetrieve
-from app.services.invested import get_open_projects, invest_funds
+from app.models import Donation, User
+from app.schemas.allocation import AllocationDB
+from app.schemas.donation import (
+    DonationBulkResult,
+    DonationCreate,
+    DonationDB,
+    DonationRetrieve,
+)
+from app.services.allocation_worker import allocation_worker
+from app.services.bulk import import_donations, publish_import
+from app.services.export import ExportFormat, MEDIA_TYPES, stream_export
+from app.services.invested import (
+    invest_with_retry,
+    run_with_retry,
+    SourceUpdate,
+)
+from app.services.open_queue import OpenEntry
 
 
 router = APIRouter()
@@ -24,18 +46,50 @@ async def create_new_donation(
     user: User = Depends(current_user),
 ):
     """Создать новое пожертвование (для авторизованных пользователей)."""
-    new_donation = await donation_crud.create(
-        donation, session, user, commit=False
-    )
+    user_id = user.id
+    if settings.allocation_worker_enabled:
+        return await allocation_worker.submit(
+            Donation, {**donation.dict(), "user_id": user_id}
+        )
+
+    async def prepare() -> Donation:
+        return await donation_crud.create(
+            {**donation.dict(), "user_id": user_id}, session, commit=False
+        )
+
+    return await invest_with_retry(prepare, session)
+
+
+@router.post(
+    "/bulk",
+    response_model=DonationBulkResult,
+    dependencies=[Depends(current_superuser)],
+)
+async def create_donations_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_superuser),
+) -> DonationBulkResult:
+    """Загрузить пожертвования JSON-массивом, NDJSON или CSV.
 
-    open_projects = await get_open_projects(session)
-    if open_projects:
-        invest_funds(new_donation, open_projects)
-        session.add_all(open_projects + [new_donation])
-    await session.commit()
-    await session.refresh(new_donation)
+    Только для суперпользователей. Все пожертвования записываются
+    от имени текущего пользователя в одной транзакции.
+    """
+    donations = await parse_bulk_request(request, DonationCreate)
+    user_id = user.id
 
-    return new_donation
+    async def operation() -> Tuple[
+        List[int], List[SourceUpdate], List[OpenEntry]
+    ]:
+        result = await import_donations(donations, user_id, session)
+        await session.commit()
+        return result
+
+    invested, updates, entries = await run_with_retry(operation, session)
+    await publish_import(Donation, updates, entries)
+    return DonationBulkResult(
+        created=len(donations), invested_amount=sum(invested)
+    )
 
 
 @router.get(
@@ -52,13 +106,74 @@ async def get_by_user_donation(
     return await donation_crud.get_by_donation(session, user)
 
 
+@router.get(
+    "/export",
+    dependencies=[Depends(superuser_readonly)],
+    response_class=StreamingResponse,
+)
+async def export_donations(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session: AsyncSession = Depends(get_async_session),
+) -> StreamingResponse:
+    """Выгрузить все пожертвования в NDJSON или CSV потоком."""
+    return StreamingResponse(
+        stream_export(
+            [
+                Donation.id,
+                Donation.user_id,
+                Donation.comment,
+                Donation.full_amount,
+                Donation.invested_amount,
+                Donation.fully_invested,
+                Donation.create_date,
+                Donation.close_date,
+            ],
+            export_format,
+            session,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+    )
+
+
 @router.get(
     "/",
     response_model=list[DonationDB],
-    dependencies=[Depends(current_superuser)],
+    dependencies=[Depends(superuser_readonly)],
 )
 async def get_all_donations(
+    request: Request,
+    response: Response,
+    user_id: Optional[PositiveInt] = None,
+    page: PageParams = Depends(),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Получить список всех пожертвований (только для суперпользователей)."""
-    return await donation_crud.get_multi(session)
+    """Получить список пожертвований (только для суперпользователей)."""
+    donations = await donation_crud.get_multi(
+        session, user_id=user_id, **page.as_filters()
+    )
+    set_next_page_link(request, response, donations, page.limit)
+    return donations
+
+
+@router.get(
+    "/{donation_id}/allocations",
+    response_model=list[AllocationDB],
+)
+async def get_donation_allocations(
+    donation_id: int,
+    request: Request,
+    response: Response,
+    page: KeysetParams = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    """Получить переводы пожертвования в проекты.
+
+    Доступно владельцу пожертвования и суперпользователям.
+    """
+    await check_donation_access(donation_id, user, session)
+    allocations = await allocation_crud.get_multi(
+        session, donation_id=donation_id, **page.as_filters()
+    )
+    set_next_page_link(request, response, allocations, page.limit)
+    return allocations
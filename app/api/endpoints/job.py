@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.validators import check_job_exists, check_job_file_ready
+from app.core.db import get_async_session
+from app.core.user import current_superuser, superuser_readonly
+from app.schemas.job import JobCreate, JobDB
+from app.services.jobs import job_runner
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=JobDB,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(current_superuser)],
+)
+async def create_job(
+    job: JobCreate,
+    session: AsyncSession = Depends(get_async_session),
+) -> JobDB:
+    """Запустить фоновую задачу (только для суперпользователей)."""
+    return await job_runner.submit(job.kind, session)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobDB,
+    dependencies=[Depends(superuser_readonly)],
+)
+async def get_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+) -> JobDB:
+    """Узнать состояние фоновой задачи (только для суперпользователей)."""
+    return await check_job_exists(job_id, session)
+
+
+@router.get(
+    "/{job_id}/file",
+    response_class=FileResponse,
+    dependencies=[Depends(superuser_readonly)],
+)
+async def download_job_file(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_session),
+) -> FileResponse:
+    """Скачать файл, сформированный задачей (для суперпользователей)."""
+    job = await check_job_exists(job_id, session)
+    check_job_file_ready(job)
+    return FileResponse(job_runner.files_dir / job.result)
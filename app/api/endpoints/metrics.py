@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import constants
+from app.core.metrics import render_metrics
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+)
+async def get_metrics() -> PlainTextResponse:
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(
+        render_metrics(), media_type=constants.METRICS_MEDIA_TYPE
+    )
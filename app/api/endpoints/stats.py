@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_session
+from app.schemas.fund_stats import FundStatsDB
+from app.services.fund_stats import get_fund_stats, stats_summary
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=FundStatsDB,
+)
+async def get_stats(
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Сводные показатели фонда одним чтением по первичному ключу."""
+    return stats_summary(await get_fund_stats(session))
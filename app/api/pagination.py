@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import Query, Request, Response
+from pydantic import PositiveInt
+
+from app import constants
+
+
+LIMIT_QUERY = Query(
+    constants.PAGE_SIZE, ge=constants.ONE, le=constants.MAX_PAGE_SIZE
+)
+AFTER_QUERY = Query(
+    None, description="ID последнего объекта предыдущей страницы."
+)
+
+
+class KeysetParams:
+    """Параметры постраничного вывода по возрастанию ID."""
+
+    def __init__(
+        self,
+        limit: int = LIMIT_QUERY,
+        after: Optional[PositiveInt] = AFTER_QUERY,
+    ) -> None:
+        self.limit = limit
+        self.after = after
+
+    def as_filters(self) -> Dict[str, Any]:
+        """Параметры для CRUDBase.get_multi."""
+        return dict(limit=self.limit, after=self.after)
+
+    def as_query(self) -> str:
+        """Проверенные параметры строкой запроса.
+
+        Параметры отсортированы, значения по умолчанию подставлены,
+        посторонние параметры отброшены: одинаковые страницы дают
+        одинаковую строку.
+        """
+        params = []
+        for name, value in sorted(self.as_filters().items()):
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            params.append((name, value))
+        return urlencode(params)
+
+
+class PageParams(KeysetParams):
+    """Параметры постраничного вывода и фильтры списков."""
+
+    def __init__(
+        self,
+        limit: int = LIMIT_QUERY,
+        after: Optional[PositiveInt] = AFTER_QUERY,
+        fully_invested: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> None:
+        super().__init__(limit, after)
+        self.fully_invested = fully_invested
+        self.created_from = created_from
+        self.created_to = created_to
+
+    def as_filters(self) -> Dict[str, Any]:
+        """Параметры для CRUDBase.get_multi."""
+        return dict(
+            super().as_filters(),
+            fully_invested=self.fully_invested,
+            created_from=self.created_from,
+            created_to=self.created_to,
+        )
+
+
+def set_next_page_link(
+    request: Request,
+    response: Response,
+    objs: List[Any],
+    limit: int,
+    query: Optional[str] = None,
+) -> None:
+    """Добавить в ответ заголовок Link на следующую страницу.
+
+    query заменяет строку запроса исходного URL.
+    """
+    if len(objs) < limit:
+        return
+    url = request.url if query is None else request.url.replace(query=query)
+    next_url = url.include_query_params(after=objs[-1].id)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -3,6 +3,9 @@ from fastapi import APIRouter
 from app.api.endpoints import (
     charity_project_router,
     donation_router,
+    job_router,
+    metrics_router,
+    stats_router,
     user_router,
 )
 
@@ -17,3 +20,6 @@ main_router.include_router(
 main_router.include_router(
     donation_router, prefix="/donation", tags=["Donation"]
 )
+main_router.include_router(stats_router, prefix="/stats", tags=["Stats"])
+main_router.include_router(job_router, prefix="/jobs", tags=["Jobs"])
+main_router.include_router(metrics_router, tags=["Metrics"])
@@ -1,11 +1,25 @@
-from typing import Optional
+from collections import Counter
+from typing import List, Optional, Type
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import constants
 from app.crud.charity_project import charity_project_crud
-from app.models import CharityProject
+from app.crud.donation import donation_crud
+from app.models import CharityProject, Donation, Job, User
+from app.services.bulk import (
+    BulkFormatError,
+    BulkValidationError,
+    parse_records,
+    SchemaType,
+    validate_records,
+)
+from app.services.jobs import (
+    FILE_JOB_KINDS,
+    job_runner,
+    JobStatus,
+)
 
 
 async def check_name_duplicate(
@@ -25,6 +39,27 @@ async def check_name_duplicate(
         )
 
 
+async def check_names_duplicate(
+    names: List[str],
+    session: AsyncSession,
+) -> None:
+    """Проверить уникальность названий новых проектов одним запросом."""
+    duplicates = {
+        name for name, count in Counter(names).items() if count > 1
+    }
+    duplicates.update(
+        await charity_project_crud.get_existing_names(names, session)
+    )
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Проекты с такими именами уже существуют: "
+                f"{', '.join(sorted(duplicates))}"
+            ),
+        )
+
+
 async def check_charity_project_exists(
     charity_project_id: int,
     session: AsyncSession,
@@ -40,6 +75,28 @@ async def check_charity_project_exists(
     return charity_project
 
 
+async def check_donation_access(
+    donation_id: int,
+    user: User,
+    session: AsyncSession,
+) -> Donation:
+    """Проверить, что пожертвование существует и доступно пользователю."""
+    donation: Optional[Donation] = await donation_crud.get(
+        donation_id, session
+    )
+    if donation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Пожертвование не найдено!",
+        )
+    if donation.user_id != user.id and not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Нет доступа к чужому пожертвованию.",
+        )
+    return donation
+
+
 async def validate_full_amount_not_less_than_invested(
     full_amount: Optional[int], project: CharityProject, session: AsyncSession
 ) -> CharityProject:
@@ -74,3 +131,51 @@ async def forbid_delete_invested_project(project: CharityProject) -> None:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Нельзя удалить проект, в который уже внесены средства.",
         )
+
+
+async def parse_bulk_request(
+    request: Request, schema: Type[SchemaType]
+) -> List[SchemaType]:
+    """Разобрать тело массовой загрузки и проверить каждую запись."""
+    try:
+        return validate_records(
+            schema,
+            parse_records(
+                await request.body(), request.headers.get("content-type", "")
+            ),
+        )
+    except BulkFormatError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Не удалось разобрать тело запроса: {error}",
+        )
+    except BulkValidationError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error.errors,
+        )
+
+
+async def check_job_exists(job_id: int, session: AsyncSession) -> Job:
+    """Проверить существование фоновой задачи по ID."""
+    job = await job_runner.get(job_id, session)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена!",
+        )
+    return job
+
+
+def check_job_file_ready(job: Job) -> None:
+    """Проверить, что задача завершилась и сформировала файл."""
+    if job.kind not in FILE_JOB_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не формирует файл!",
+        )
+    if job.status != JobStatus.done:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Файл ещё не готов!",
+        )
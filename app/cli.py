@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import csv
+import sys
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.services.fund_stats import find_stats_drift, rebuild_fund_stats
+from app.services.project_cache import project_list_cache
+
+
+async def rebalance(args: argparse.Namespace) -> int:
+    """Сопоставить открытые пожертвования и проекты и вывести CSV.
+
+    Кэш в памяти принадлежит процессу приложения, и сбросить его
+    отсюда нельзя, поэтому без Redis --apply требует --offline:
+    подтверждения, что приложение остановлено.
+    """
+    if args.apply and not args.offline and settings.cache_backend != "redis":
+        print(
+            "Кэш приложения в памяти отсюда не сбросить: используйте "
+            "CACHE_BACKEND=redis или остановите приложение и добавьте "
+            "--offline.",
+            file=sys.stderr,
+        )
+        return 2
+    try:
+        from app.services.allocation_numpy import (
+            apply_rebalance,
+            plan_rebalance,
+        )
+    except ImportError:
+        print("Для команды rebalance нужен пакет numpy.", file=sys.stderr)
+        return 2
+    async with AsyncSessionLocal() as session:
+        plan = await plan_rebalance(session)
+        if args.apply:
+            await apply_rebalance(plan, session)
+            await session.commit()
+    if args.apply and plan.allocations:
+        await project_list_cache.invalidate()
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["donation_id", "charity_project_id", "amount"])
+    writer.writerows(plan.allocations)
+    return 0
+
+
+async def stats(args: argparse.Namespace) -> int:
+    """Сверить сводные показатели с таблицами или пересчитать их."""
+    async with AsyncSessionLocal() as session:
+        if args.rebuild:
+            values = await rebuild_fund_stats(session)
+            await session.commit()
+            for name, value in values.items():
+                print(f"{name}: {value}")
+            return 0
+        drift = await find_stats_drift(session)
+    for name, (stored, actual) in drift.items():
+        print(f"{name}: сохранено {stored}, должно быть {actual}")
+    return 1 if drift else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Парсер команд обслуживания фонда."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="Обслуживание фонда."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebalance_parser = commands.add_parser(
+        "rebalance",
+        help="распределить все открытые пожертвования по открытым проектам",
+    )
+    rebalance_parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="записать результат в БД (по умолчанию только вывод)",
+    )
+    rebalance_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="приложение остановлено, сбрасывать его кэш не нужно",
+    )
+    rebalance_parser.set_defaults(handler=rebalance)
+    stats_parser = commands.add_parser(
+        "stats",
+        help="сверить сводные показатели фонда с таблицами",
+    )
+    stats_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="пересчитать показатели с нуля и сохранить",
+    )
+    stats_parser.set_defaults(handler=stats)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
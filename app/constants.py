@@ -7,5 +7,87 @@ THREE = 3
 ONE_HUNDRED = 100
 FIVE_HUNDRED = 500
 
+# Размер страницы списков по умолчанию и максимальный
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 # Время жизни JWT токена в секундах (1 час)
 JWT_LIFETIME_SECONDS = 3600
+
+# Время жизни пользователя в кэше аутентификации, секунды
+USER_CACHE_TTL = 30
+
+# Начальный размер пачки при чтении открытых объектов для инвестирования
+OPEN_PREFIX_BATCH_SIZE = 16
+
+# Количество строк, которое выгрузка читает из курсора за раз
+EXPORT_CHUNK_SIZE = 500
+
+# Максимальное число ключей в кэше в памяти процесса
+CACHE_MAX_SIZE = 1024
+
+# Порт Redis-совместимого сервера кэша по умолчанию
+REDIS_PORT = 6379
+
+# Предельное время ответа сервера кэша, секунды
+CACHE_TIMEOUT = 0.5
+
+# Число попыток распределить средства при конкурентных изменениях
+ALLOCATION_ATTEMPTS = 10
+# Базовая пауза между попытками распределения, секунды
+ALLOCATION_RETRY_DELAY = 0.005
+# Сообщение SQLite о временной блокировке базы
+SQLITE_LOCKED_MESSAGE = "database is locked"
+
+# Максимальное число команд, которые обработчик распределений
+# применяет в одной транзакции
+ALLOCATION_BATCH_MAX_SIZE = 200
+# Сколько миллисекунд после первой команды писатель ждёт остальные
+# команды пачки
+ALLOCATION_BATCH_WINDOW_MS = 5
+# Вместимость очереди команд обработчика распределений
+ALLOCATION_QUEUE_SIZE = 1024
+
+# Число строк в одном многострочном INSERT при массовой загрузке
+BULK_INSERT_CHUNK_SIZE = 500
+
+# ID единственной строки сводных показателей фонда
+FUND_STATS_ID = 1
+# Допустимое расхождение суммарного времени наполнения проектов, секунды
+FUND_STATS_FILL_TOLERANCE = 1.0
+
+# Каталог, куда фоновые задачи записывают файлы отчётов
+REPORTS_DIR = "reports"
+
+# Сколько фоновых задач выполняется одновременно
+JOB_CONCURRENCY = 2
+# Максимальная длина вида фоновой задачи
+JOB_KIND_MAX_LENGTH = 50
+# Максимальная длина состояния фоновой задачи
+JOB_STATUS_MAX_LENGTH = 20
+# Прогресс завершённой фоновой задачи, проценты
+JOB_PROGRESS_DONE = 100
+# Как часто обработчик отмечает свои активные задачи, секунды
+JOB_HEARTBEAT_SECONDS = 10
+# Активная задача без отметки дольше этого считается прерванной, секунды
+JOB_STALE_SECONDS = 60
+
+# Порог медленного SQL-запроса для журнала, миллисекунды
+SLOW_QUERY_MS = 100
+# Верхние границы корзин гистограммы числа SQL-запросов на HTTP-запрос
+SQL_STATEMENTS_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+# Верхние границы корзин гистограммы времени SQL на HTTP-запрос, секунды
+SQL_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+# Верхние границы корзин гистограммы времени HTTP-запроса, секунды
+REQUEST_SECONDS_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+# Верхние границы корзин гистограмм числа строк одного распределения
+ALLOCATION_ROWS_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# Верхние границы корзин гистограммы суммы одного распределения
+ALLOCATION_AMOUNT_BUCKETS = (
+    0, 100, 1000, 10000, 100000, 1000000, 10000000
+)
+
+# Тип содержимого текстового формата метрик Prometheus
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4"
@@ -0,0 +1,370 @@
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from app import constants
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheError(Exception):
+    """Ошибка, которую вернул сервер кэша."""
+
+
+class CacheBackend(ABC):
+    """Интерфейс хранилища кэша: байтовые значения по строковым ключам."""
+
+    def __init__(self) -> None:
+        self.hits = constants.ZERO
+        self.misses = constants.ZERO
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Получить значение и учесть попадание или промах."""
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[bytes]:
+        """Получить значение без учёта статистики."""
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[int] = None
+    ) -> None:
+        """Сохранить значение; ttl — время жизни в секундах."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удалить значение."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Атомарно увеличить счётчик и вернуть новое значение."""
+
+    async def close(self) -> None:
+        """Освободить ресурсы хранилища."""
+
+
+class MemoryCache(CacheBackend):
+    """Кэш в памяти процесса с TTL и вытеснением по LRU.
+
+    Счётчики (incr) хранятся отдельно и не вытесняются: сброс версии
+    пространства ключей вернул бы в оборот его старые значения.
+    """
+
+    def __init__(
+        self,
+        max_size: int = constants.CACHE_MAX_SIZE,
+        default_ttl: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._items: "OrderedDict[str, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._counters: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _lookup(self, key: str) -> Any:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._items[key] = (value, expires_at)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        return self._lookup(key)
+
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[int] = None
+    ) -> None:
+        self._store(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._items.pop(key, None)
+        self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = self._counters.get(key, constants.ZERO) + 1
+        self._counters[key] = value
+        return value
+
+
+def encode_command(*args: Any) -> bytes:
+    """Закодировать команду в протоколе RESP."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Прочитать один ответ в протоколе RESP."""
+    line = await reader.readuntil(b"\r\n")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        raise CacheError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < constants.ZERO:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < constants.ZERO:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise CacheError(f"Неизвестный ответ сервера кэша: {line!r}")
+
+
+class RedisCache(CacheBackend):
+    """Кэш на любом сервере, совместимом с протоколом Redis (RESP)."""
+
+    def __init__(
+        self, url: str, timeout: float = constants.CACHE_TIMEOUT
+    ) -> None:
+        super().__init__()
+        self.timeout = timeout
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or constants.REDIS_PORT
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or constants.ZERO)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port
+        )
+        if self.password:
+            await self._send("AUTH", self.password)
+        if self.db:
+            await self._send("SELECT", self.db)
+
+    async def _send(self, *args: Any) -> Any:
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _execute(self, *args: Any) -> Any:
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(*args)
+            except (
+                OSError,
+                asyncio.IncompleteReadError,
+                asyncio.CancelledError,
+            ):
+                self._disconnect()
+                raise
+
+    async def execute(self, *args: Any) -> Any:
+        """Выполнить команду, при необходимости открыв соединение.
+
+        Ожидание соединения, подключение и ответ ограничены timeout
+        секундами; по истечении соединение закрывается, а вызывающий
+        код получает CacheError, то есть промах.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock, self._writer = loop, asyncio.Lock(), None
+        try:
+            return await asyncio.wait_for(self._execute(*args), self.timeout)
+        except asyncio.TimeoutError:
+            raise CacheError(
+                f"Сервер кэша не ответил за {self.timeout} с"
+            ) from None
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[int] = None
+    ) -> None:
+        if ttl is None:
+            await self.execute("SET", key, value)
+        else:
+            await self.execute("SET", key, value, "EX", ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def incr(self, key: str) -> int:
+        return await self.execute("INCR", key)
+
+    async def close(self) -> None:
+        self._disconnect()
+
+
+class CacheNamespace:
+    """Группа ключей с общей инвалидацией через счётчик версии.
+
+    Внутри пространства можно сбрасывать отдельные группы ключей через
+    метки (marker): так не нужен свой счётчик на каждую группу.
+    Ошибки хранилища не пробрасываются: для вызывающего кода
+    недоступный кэш выглядит как промах.
+    """
+
+    def __init__(self, name: str, ttl: Optional[int] = None) -> None:
+        self.name = name
+        self.ttl = ttl
+
+    async def _read_version(self, backend: CacheBackend) -> int:
+        version = await backend._get(f"{self.name}:version")
+        return int(version or constants.ZERO)
+
+    def _versioned_key(self, version: Union[int, str], key: str) -> str:
+        return f"{self.name}:{version}:{key}"
+
+    def _marker_key(self, group: str) -> str:
+        return f"{self.name}:{group}:marker"
+
+    async def version(self) -> Optional[int]:
+        """Текущая версия пространства ключей; None, если кэш недоступен.
+
+        Версию нужно прочитать до чтения данных из БД и передать в get
+        и set: тогда значение, собранное до конкурентной инвалидации,
+        сохранится под старой версией и не будет отдано.
+        """
+        try:
+            return await self._read_version(get_cache())
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+            return None
+
+    async def marker(self, group: str) -> Optional[str]:
+        """Метка группы ключей; None, если кэш недоступен.
+
+        Метка — случайная строка в самом хранилище, она вытесняется и
+        истекает как обычное значение. Отсутствие метки значит, что
+        прежние значения группы недействительны: заводится новая.
+        Метку нужно прочитать до чтения данных из БД и передать в get
+        и set вместо версии.
+        """
+        backend = get_cache()
+        try:
+            marker = await backend._get(self._marker_key(group))
+            if marker is None:
+                marker = uuid.uuid4().hex.encode()
+                await backend.set(self._marker_key(group), marker, self.ttl)
+            return marker.decode()
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+            return None
+
+    async def invalidate_group(self, group: str) -> None:
+        """Сделать недоступными значения, сохранённые с меткой группы."""
+        try:
+            await get_cache().delete(self._marker_key(group))
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+
+    async def get(
+        self, key: str, version: Optional[Union[int, str]] = None
+    ) -> Optional[bytes]:
+        """Получить значение указанной или текущей версии."""
+        backend = get_cache()
+        try:
+            if version is None:
+                version = await self._read_version(backend)
+            return await backend.get(self._versioned_key(version, key))
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+            return None
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        version: Optional[Union[int, str]] = None,
+    ) -> None:
+        """Сохранить значение в указанной или текущей версии."""
+        backend = get_cache()
+        try:
+            if version is None:
+                version = await self._read_version(backend)
+            await backend.set(
+                self._versioned_key(version, key), value, self.ttl
+            )
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+
+    async def invalidate(self) -> None:
+        """Сделать недоступными все ранее сохранённые значения."""
+        try:
+            await get_cache().incr(f"{self.name}:version")
+        except (OSError, asyncio.IncompleteReadError, CacheError) as error:
+            logger.warning("Кэш %s недоступен: %s", self.name, error)
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def create_cache() -> CacheBackend:
+    """Создать хранилище кэша по настройкам приложения."""
+    if settings.cache_backend == "redis":
+        return RedisCache(settings.cache_url, settings.cache_timeout)
+    return MemoryCache(settings.cache_max_size, settings.cache_default_ttl)
+
+
+def get_cache() -> CacheBackend:
+    """Общее хранилище кэша приложения, создаётся при первом обращении.
+
+    Код приложения работает с кэшем через CacheNamespace, которое
+    берёт хранилище отсюда при каждом обращении.
+    """
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
+
+
+def set_cache(backend: Optional[CacheBackend]) -> None:
+    """Заменить хранилище кэша; None — пересоздать по настройкам."""
+    global _cache
+    _cache = backend
@@ -2,6 +2,8 @@ from typing import Optional
 
 from pydantic import BaseSettings, EmailStr
 
+from app import constants
+
 
 class Settings(BaseSettings):
     """Конфигурация приложения."""
@@ -9,9 +11,37 @@ class Settings(BaseSettings):
     app_title: str = "Бронирование переговорок"
     description: str = "Сервис для бронирования"
     database_uri: str = "sqlite+aiosqlite:///./fastapi.db"
+    sql_echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    sqlite_tuning: bool = True
+    sqlite_busy_timeout: int = 5000
+    sqlite_cache_size: int = -64000
+    sqlite_mmap_size: int = 268435456
     secret: str = "SECRET"
     first_superuser_email: Optional[EmailStr] = None
     first_superuser_password: Optional[str] = None
+    open_queue_enabled: bool = False
+    project_list_cache_enabled: bool = False
+    project_list_cache_ttl: int = 60
+    cache_backend: str = "memory"
+    cache_url: str = "redis://localhost:6379/0"
+    cache_max_size: int = constants.CACHE_MAX_SIZE
+    cache_default_ttl: Optional[int] = None
+    cache_timeout: float = constants.CACHE_TIMEOUT
+    user_cache_enabled: bool = False
+    user_cache_ttl: int = constants.USER_CACHE_TTL
+    jwt_claims_enabled: bool = False
+    allocation_worker_enabled: bool = False
+    allocation_batch_max_size: int = constants.ALLOCATION_BATCH_MAX_SIZE
+    allocation_queue_size: int = constants.ALLOCATION_QUEUE_SIZE
+    allocation_batch_window_ms: int = constants.ALLOCATION_BATCH_WINDOW_MS
+    reports_dir: str = constants.REPORTS_DIR
+    job_concurrency: int = constants.JOB_CONCURRENCY
+    server_timing_enabled: bool = True
+    slow_query_ms: int = constants.SLOW_QUERY_MS
 
     class Config:
         env_file: str = ".env"
@@ -1,10 +1,15 @@
-from typing import AsyncGenerator
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Dict
 
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, event, Integer
+from sqlalchemy.engine import Dialect, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, declared_attr, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import pool_checkout_histogram
 
 
 class PreBase:
@@ -19,7 +24,92 @@ class PreBase:
 
 Base = declarative_base(cls=PreBase)
 
-engine = create_async_engine(settings.database_uri, echo=True)
+
+def utc_now() -> datetime:
+    """Текущее время UTC без часового пояса, как его хранит DateTime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def stored_utc_now(dialect: Dialect) -> datetime:
+    """Текущее время UTC в том виде, в каком БД вернёт его из колонки
+    DateTime(timezone=True).
+
+    SQLite хранит такие колонки без часового пояса. Объект, который
+    после коммита не перечитывается, должен совпадать с прочитанным.
+    """
+    if dialect.name == "sqlite":
+        return utc_now()
+    return datetime.now(timezone.utc)
+
+
+def stored_utc_now_default(context: Any) -> datetime:
+    """Значение по умолчанию для колонок DateTime(timezone=True).
+
+    Фабрики тестовых данных вызывают его без контекста выполнения.
+    """
+    if context is None:
+        return datetime.now(timezone.utc)
+    return stored_utc_now(context.dialect)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который учитывает время ожидания соединения."""
+
+    def _do_get(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_histogram.observe(
+                (), time.perf_counter() - started_at
+            )
+
+
+def is_sqlite_file(database_uri: str) -> bool:
+    """Проверить, что адрес указывает на файловую БД SQLite."""
+    url = make_url(database_uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def engine_options(database_uri: str) -> Dict[str, Any]:
+    """Параметры движка и пула соединений из настроек."""
+    options: Dict[str, Any] = dict(
+        echo=settings.sql_echo,
+        pool_pre_ping=settings.pool_pre_ping,
+        pool_recycle=settings.pool_recycle,
+    )
+    if make_url(database_uri).get_backend_name() == "sqlite":
+        if not is_sqlite_file(database_uri):
+            return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+    )
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Настроить новое соединение SQLite: WAL, синхронизация и кэш."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout}")
+    cursor.execute(f"PRAGMA cache_size={settings.sqlite_cache_size}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    cursor.close()
+
+
+engine = create_async_engine(
+    settings.database_uri, **engine_options(settings.database_uri)
+)
+if settings.sqlite_tuning and is_sqlite_file(settings.database_uri):
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -0,0 +1,201 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from app import constants
+from app.core.cache import get_cache
+from app.core.config import settings
+
+
+Labels = Tuple[str, ...]
+
+
+@dataclass
+class HistogramSeries:
+    """Наблюдения гистограммы с одним набором меток."""
+
+    bucket_counts: List[int]
+    count: int = constants.ZERO
+    sum: float = constants.ZERO
+
+
+@dataclass
+class Histogram:
+    """Гистограмма в памяти процесса с верхними границами корзин.
+
+    Наблюдения добавляются из потока цикла событий без блокировок:
+    observe — это поиск корзины и несколько сложений.
+    """
+
+    name: str
+    description: str
+    label_names: Tuple[str, ...]
+    buckets: Sequence[float]
+    series: Dict[Labels, HistogramSeries] = field(default_factory=dict)
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = HistogramSeries(
+                [constants.ZERO] * len(self.buckets)
+            )
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.sum += value
+
+    def clear(self) -> None:
+        self.series.clear()
+
+    def render(self) -> Iterator[str]:
+        """Строки гистограммы в текстовом формате Prometheus."""
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in list(self.series.items()):
+            pairs = list(zip(self.label_names, labels))
+            cumulative = constants.ZERO
+            for bound, count in zip(self.buckets, series.bucket_counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket"
+                    f"{format_labels(pairs + [('le', format_value(bound))])}"
+                    f" {cumulative}"
+                )
+            yield (
+                f"{self.name}_bucket{format_labels(pairs + [('le', '+Inf')])}"
+                f" {series.count}"
+            )
+            yield (
+                f"{self.name}_sum{format_labels(pairs)} "
+                f"{format_value(series.sum)}"
+            )
+            yield f"{self.name}_count{format_labels(pairs)} {series.count}"
+
+
+def format_value(value: float) -> str:
+    """Число в записи Prometheus: целые без дробной части."""
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    """Метки в фигурных скобках с экранированием значений."""
+    rendered = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def render_values(
+    name: str,
+    description: str,
+    metric_type: str,
+    label_names: Tuple[str, ...],
+    values: Dict[Labels, float],
+) -> Iterator[str]:
+    """Строки счётчика или значения в текстовом формате Prometheus."""
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} {metric_type}"
+    for labels, value in values.items():
+        yield (
+            f"{name}{format_labels(zip(label_names, labels))} "
+            f"{format_value(value)}"
+        )
+
+
+def render_cache() -> Iterator[str]:
+    """Попадания и промахи общего кэша приложения."""
+    backend = get_cache()
+    labels = (settings.cache_backend,)
+    yield from render_values(
+        "cache_hits_total",
+        "Попадания в кэш.",
+        "counter",
+        ("backend",),
+        {labels: backend.hits},
+    )
+    yield from render_values(
+        "cache_misses_total",
+        "Промахи кэша.",
+        "counter",
+        ("backend",),
+        {labels: backend.misses},
+    )
+    lookups = backend.hits + backend.misses
+    yield from render_values(
+        "cache_hit_ratio",
+        "Доля попаданий среди обращений к кэшу.",
+        "gauge",
+        ("backend",),
+        {labels: backend.hits / lookups} if lookups else {},
+    )
+
+
+request_duration_histogram = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса, секунды.",
+    ("method", "route"),
+    constants.REQUEST_SECONDS_BUCKETS,
+)
+statements_histogram = Histogram(
+    "http_request_sql_statements",
+    "Число SQL-запросов на HTTP-запрос.",
+    ("method", "route"),
+    constants.SQL_STATEMENTS_BUCKETS,
+)
+sql_seconds_histogram = Histogram(
+    "http_request_sql_seconds",
+    "Суммарное время SQL-запросов на HTTP-запрос, секунды.",
+    ("method", "route"),
+    constants.SQL_SECONDS_BUCKETS,
+)
+pool_checkout_histogram = Histogram(
+    "db_pool_checkout_seconds",
+    "Ожидание соединения из пула, включая открытие нового, секунды.",
+    (),
+    constants.SQL_SECONDS_BUCKETS,
+)
+allocation_scanned_histogram = Histogram(
+    "allocation_rows_scanned",
+    "Открытых объектов прочитано за одно распределение.",
+    ("target",),
+    constants.ALLOCATION_ROWS_BUCKETS,
+)
+allocation_updated_histogram = Histogram(
+    "allocation_rows_updated",
+    "Открытых объектов изменено за одно распределение.",
+    ("target",),
+    constants.ALLOCATION_ROWS_BUCKETS,
+)
+allocation_amount_histogram = Histogram(
+    "allocation_amount",
+    "Сумма, распределённая за одно распределение.",
+    ("target",),
+    constants.ALLOCATION_AMOUNT_BUCKETS,
+)
+
+HISTOGRAMS = (
+    request_duration_histogram,
+    statements_histogram,
+    sql_seconds_histogram,
+    pool_checkout_histogram,
+    allocation_scanned_histogram,
+    allocation_updated_histogram,
+    allocation_amount_histogram,
+)
+
+
+def render_metrics() -> str:
+    """Все метрики процесса в текстовом формате Prometheus."""
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(render_cache())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,149 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import constants
+from app.core.config import settings
+from app.core.metrics import (
+    request_duration_histogram,
+    sql_seconds_histogram,
+    statements_histogram,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestTiming:
+    """Запросы к БД, выполненные при обработке одного HTTP-запроса.
+
+    Объект изменяемый: обработчик может выполняться в другой задаче или
+    потоке с копией контекста, и тогда он видит тот же объект.
+    """
+
+    statements: int = constants.ZERO
+    seconds: float = constants.ZERO
+    slowest_seconds: float = constants.ZERO
+    slowest_statement: Optional[str] = None
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+request_timing: ContextVar[Optional[RequestTiming]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+def before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    context.query_started_at = time.perf_counter()
+
+
+def after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    seconds = time.perf_counter() - context.query_started_at
+    timing = request_timing.get()
+    if timing is not None:
+        timing.add(statement, seconds)
+    if (
+        settings.slow_query_ms >= constants.ZERO and
+        seconds * 1000 >= settings.slow_query_ms
+    ):
+        logger.warning(
+            "Медленный SQL-запрос (%.1f мс): %s", seconds * 1000, statement
+        )
+
+
+def instrument_engines() -> None:
+    """Учитывать время SQL-запросов всех движков."""
+    if not event.contains(
+        Engine, "before_cursor_execute", before_cursor_execute
+    ):
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+
+
+def server_timing(timing: RequestTiming, total_seconds: float) -> str:
+    """Значение заголовка Server-Timing для HTTP-запроса."""
+    return ", ".join(
+        (
+            f'db;desc="{timing.statements} SQL";'
+            f"dur={timing.seconds * 1000:.2f}",
+            f"db-slowest;dur={timing.slowest_seconds * 1000:.2f}",
+            f"total;dur={total_seconds * 1000:.2f}",
+        )
+    )
+
+
+class ServerTimingMiddleware:
+    """ASGI-промежуточный слой учёта SQL-запросов каждого HTTP-запроса.
+
+    Добавляет к ответу заголовок Server-Timing с числом и временем
+    запросов к БД и по завершении пополняет гистограммы времени
+    обработки и SQL-запросов по маршрутам.
+    Запросы, выполненные уже после начала ответа (потоковые выгрузки),
+    попадают только в гистограммы.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming()
+        token = request_timing.set(timing)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message: Dict) -> None:
+            if message["type"] == "http.response.start":
+                header = server_timing(
+                    timing, time.perf_counter() - started_at
+                )
+                message = dict(
+                    message,
+                    headers=[
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode()),
+                    ],
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timing.reset(token)
+            route = scope.get("route")
+            labels = (
+                scope["method"],
+                route.path if route is not None else "unmatched",
+            )
+            request_duration_histogram.observe(
+                labels, time.perf_counter() - started_at
+            )
+            statements_histogram.observe(labels, timing.statements)
+            sql_seconds_histogram.observe(labels, timing.seconds)
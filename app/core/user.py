@@ -1,8 +1,12 @@
-from typing import AsyncGenerator, Optional, Union
+import time
+import uuid
+from typing import Any, AsyncGenerator, Dict, Optional, Union
 
-from fastapi import Depends, Request
+import jwt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi_users import (
     BaseUserManager,
+    exceptions,
     FastAPIUsers,
     IntegerIDMixin,
     InvalidPasswordException,
@@ -12,6 +16,7 @@ from fastapi_users.authentication import (
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,6 +25,8 @@ from app.core.config import settings
 from app.core.db import get_async_session
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.services.token_revocation import revoked_tokens
+from app.services.user_cache import user_cache
 
 
 async def get_user_db(
@@ -32,11 +39,106 @@ async def get_user_db(
 bearer_transport: BearerTransport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
+class CachedJWTStrategy(JWTStrategy[User, int]):
+    """Стратегия JWT, которая берёт пользователя токена из кэша.
+
+    Подпись и срок действия токена проверяются на каждый запрос,
+    из кэша читается только строка пользователя. В режиме утверждений
+    токен несёт is_active, is_superuser, iat и jti, его можно отозвать,
+    а права суперпользователя проверить без обращения к БД.
+    """
+
+    def __init__(self, secret: str, lifetime_seconds: int) -> None:
+        super().__init__(secret=secret, lifetime_seconds=lifetime_seconds)
+        self.key = secret.encode()
+
+    @property
+    def encode_key(self) -> bytes:
+        return self.key
+
+    @property
+    def decode_key(self) -> bytes:
+        return self.key
+
+    def decode(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Данные действующего токена или None."""
+        if token is None:
+            return None
+        try:
+            data = decode_jwt(
+                token,
+                self.decode_key,
+                self.token_audience,
+                algorithms=[self.algorithm],
+            )
+        except jwt.PyJWTError:
+            return None
+        if data.get("user_id") is None or (
+            settings.jwt_claims_enabled and revoked_tokens.is_revoked(data)
+        ):
+            return None
+        return data
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: BaseUserManager[User, int],
+    ) -> Optional[User]:
+        data = self.decode(token)
+        if data is None:
+            return None
+        try:
+            user_id = user_manager.parse_id(data["user_id"])
+        except exceptions.InvalidID:
+            return None
+        version = None
+        if settings.user_cache_enabled:
+            version = await user_cache.version(user_id)
+            user = await user_cache.get(user_id, token, version)
+            if user is not None:
+                return user
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        if settings.user_cache_enabled:
+            await user_cache.set(user, token, version)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        if not settings.jwt_claims_enabled:
+            return await super().write_token(user)
+        data = {
+            "user_id": str(user.id),
+            "aud": self.token_audience,
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser,
+            "iat": time.time(),
+            "jti": uuid.uuid4().hex,
+        }
+        return generate_jwt(
+            data,
+            self.encode_key,
+            self.lifetime_seconds,
+            algorithm=self.algorithm,
+        )
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        data = self.decode(token)
+        if data is None or "jti" not in data:
+            await super().destroy_token(token, user)
+            return
+        revoked_tokens.revoke_token(data["jti"], data["exp"])
+
+
+jwt_strategy = CachedJWTStrategy(
+    secret=settings.secret, lifetime_seconds=constants.JWT_LIFETIME_SECONDS
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    """Создать стратегию JWT с секретом и временем жизни токена."""
-    return JWTStrategy(
-        secret=settings.secret, lifetime_seconds=constants.JWT_LIFETIME_SECONDS
-    )
+    """Стратегия JWT с секретом и временем жизни токена."""
+    return jwt_strategy
 
 
 auth_backend: AuthenticationBackend = AuthenticationBackend(
@@ -46,6 +148,10 @@ auth_backend: AuthenticationBackend = AuthenticationBackend(
 )
 
 
+# Изменение этих полей отзывает выпущенные пользователю токены
+REVOKING_FIELDS = frozenset(("is_active", "is_superuser", "password"))
+
+
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     """Менеджер пользователей с кастомной валидацией пароля."""
 
@@ -73,6 +179,23 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         """Действия после успешной регистрации пользователя."""
         print(f"Пользователь {user.email} зарегистрирован.")
 
+    async def on_after_update(
+        self,
+        user: User,
+        update_dict: Dict[str, Any],
+        request: Optional[Request] = None,
+    ) -> None:
+        """Сбросить кэш пользователя после изменения его данных.
+
+        При смене прав или пароля отзываются и все выпущенные
+        пользователю токены с утверждениями.
+        """
+        await user_cache.invalidate(user.id)
+        if settings.jwt_claims_enabled and (
+            REVOKING_FIELDS.intersection(update_dict)
+        ):
+            revoked_tokens.revoke_user(user.id)
+
 
 async def get_user_manager(
     user_db: SQLAlchemyUserDatabase[User, int] = Depends(get_user_db),
@@ -88,3 +211,22 @@ fastapi_users: FastAPIUsers[User, int] = FastAPIUsers[User, int](
 
 current_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
+
+
+async def claims_superuser(
+    token: Optional[str] = Depends(bearer_transport.scheme),
+) -> User:
+    """Суперпользователь по утверждениям JWT, без запроса к БД."""
+    data = jwt_strategy.decode(token)
+    if data is None or not data.get("is_active"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    if not data.get("is_superuser"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    return User(id=int(data["user_id"]), is_active=True, is_superuser=True)
+
+
+# Зависимость для эндпоинтов суперпользователя, которые только читают
+# данные: в режиме утверждений права берутся из токена
+superuser_readonly = (
+    claims_superuser if settings.jwt_claims_enabled else current_superuser
+)
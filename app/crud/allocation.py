@@ -0,0 +1,39 @@
+from typing import Any, List, Type, Union
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models import Allocation, CharityProject, Donation
+
+
+class AllocationCRUD(CRUDBase[Allocation, Any, Any]):
+    async def get_unbalanced_ids(
+        self,
+        model: Type[Union[CharityProject, Donation]],
+        session: AsyncSession,
+    ) -> List[int]:
+        """ID объектов model, чья вложенная сумма расходится с журналом."""
+        column = (
+            Allocation.donation_id
+            if model is Donation
+            else Allocation.charity_project_id
+        )
+        ledger = (
+            select(
+                column.label("id"),
+                func.sum(Allocation.amount).label("amount"),
+            )
+            .group_by(column)
+            .subquery()
+        )
+        result = await session.execute(
+            select(model.id)
+            .outerjoin(ledger, ledger.c.id == model.id)
+            .where(model.invested_amount != func.coalesce(ledger.c.amount, 0))
+            .order_by(model.id)
+        )
+        return result.scalars().all()
+
+
+allocation_crud = AllocationCRUD(Allocation)
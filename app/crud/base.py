@@ -1,7 +1,8 @@
-from typing import Generic, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import Any, Generic, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import Base
@@ -13,6 +14,17 @@ CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
 
+async def refresh_expired(db_obj: Base, session: AsyncSession) -> None:
+    """Перечитать объект, только если коммит пометил его устаревшим.
+
+    Сессии приложения не сбрасывают объекты при коммите, а id, даты и
+    версия строки известны после flush, поэтому отдельный SELECT
+    нужен только сессиям с expire_on_commit=True.
+    """
+    if inspect(db_obj).expired_attributes:
+        await session.refresh(db_obj)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Базовый класс CRUD-операций."""
 
@@ -31,9 +43,34 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         )
         return db_obj.scalars().first()
 
-    async def get_multi(self, session: AsyncSession) -> list[ModelType]:
-        """Получить список всех объектов."""
-        db_objs = await session.execute(select(self.model))
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        **filters: Any,
+    ) -> list[ModelType]:
+        """Получить список объектов по возрастанию ID.
+
+        Постраничный вывод строится по ключу: after — ID последнего
+        объекта предыдущей страницы. Фильтры со значением None
+        не применяются.
+        """
+        query = select(self.model).order_by(self.model.id)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        if created_from is not None:
+            query = query.where(self.model.create_date >= created_from)
+        if created_to is not None:
+            query = query.where(self.model.create_date < created_to)
+        for field, value in filters.items():
+            if value is not None:
+                query = query.where(getattr(self.model, field) == value)
+        if limit is not None:
+            query = query.limit(limit)
+        db_objs = await session.execute(query)
         return db_objs.scalars().all()
 
     async def create(
@@ -51,7 +88,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session.add(db_obj)
         if commit:
             await session.commit()
-            await session.refresh(db_obj)
+            await refresh_expired(db_obj, session)
         return db_obj
 
     async def update(
@@ -74,7 +111,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session.add(db_obj)
         if commit:
             await session.commit()
-            await session.refresh(db_obj)
+            await refresh_expired(db_obj, session)
         return db_obj
 
     async def remove(
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,5 +20,16 @@ class CharityProjectCRUD(CRUDBase[CharityProject, Any, Any]):
         )
         return result.scalars().first()
 
+    async def get_existing_names(
+        self,
+        names: List[str],
+        session: AsyncSession,
+    ) -> List[str]:
+        """Получить уже занятые названия из списка одним запросом."""
+        result = await session.execute(
+            select(CharityProject.name).where(CharityProject.name.in_(names))
+        )
+        return result.scalars().all()
+
 
 charity_project_crud = CharityProjectCRUD(CharityProject)
@@ -1,8 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from app.api.routers import main_router
 from app.core.config import settings
+from app.core.db import AsyncSessionLocal
 from app.core.init_db import create_first_superuser
+from app.core.timing import instrument_engines, ServerTimingMiddleware
+from app.services.allocation_worker import allocation_worker
+from app.services.invested import AllocationConflict
+from app.services.jobs import job_runner
+from app.services.open_queue import rebuild_open_queues
 
 
 app: FastAPI = FastAPI(
@@ -11,7 +18,32 @@ app: FastAPI = FastAPI(
 
 app.include_router(main_router)
 
+if settings.server_timing_enabled:
+    instrument_engines()
+    app.add_middleware(ServerTimingMiddleware)
+
+
+@app.exception_handler(AllocationConflict)
+async def allocation_conflict_handler(
+    request: Request, exc: AllocationConflict
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT, content={"detail": str(exc)}
+    )
+
 
 @app.on_event("startup")
 async def startup() -> None:
     await create_first_superuser()
+    if settings.open_queue_enabled:
+        async with AsyncSessionLocal() as session:
+            await rebuild_open_queues(session)
+    if settings.allocation_worker_enabled:
+        await allocation_worker.start()
+    await job_runner.start()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await allocation_worker.stop()
+    await job_runner.stop()
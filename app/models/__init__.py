@@ -1,3 +1,6 @@
+from .allocation import Allocation  # noqa
 from .charity_project import CharityProject  # noqa
 from .donation import Donation  # noqa
+from .fund_stats import FundStats  # noqa
+from .job import Job  # noqa
 from .user import User  # noqa
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+
+from app.core.db import Base, stored_utc_now_default
+
+
+class Allocation(Base):
+    """Перевод средств пожертвования в проект."""
+
+    donation_id = Column(
+        Integer, ForeignKey("donation.id"), nullable=False, index=True
+    )
+    charity_project_id = Column(
+        Integer, ForeignKey("charityproject.id"), nullable=False, index=True
+    )
+    amount = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=stored_utc_now_default,
+        nullable=False,
+    )
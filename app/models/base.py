@@ -1,10 +1,61 @@
-from datetime import datetime, timezone
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, Integer
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    text,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declared_attr
+from sqlalchemy.sql.functions import FunctionElement
 
 from app import constants
-from app.core.db import Base
+from app.core.db import Base, stored_utc_now_default
+
+
+def open_rows_index(table_name: str) -> Index:
+    """Частичный индекс открытых записей в порядке создания."""
+    return Index(
+        f"ix_{table_name}_open_create_date",
+        "fully_invested",
+        "create_date",
+        sqlite_where=text("fully_invested IS 0"),
+        postgresql_where=text("fully_invested IS false"),
+    )
+
+
+class SecondsBetween(FunctionElement):
+    """Число секунд между двумя датами в диалекте текущей БД."""
+
+    name = "seconds_between"
+    inherit_cache = True
+    type = Float()
+
+
+@compiles(SecondsBetween)
+def compile_seconds_between(element: SecondsBetween, compiler, **kw) -> str:
+    start, end = list(element.clauses)
+    return (
+        f"EXTRACT(EPOCH FROM ({compiler.process(end, **kw)} - "
+        f"{compiler.process(start, **kw)}))"
+    )
+
+
+@compiles(SecondsBetween, "sqlite")
+def compile_seconds_between_sqlite(
+    element: SecondsBetween, compiler, **kw
+) -> str:
+    start, end = list(element.clauses)
+    return (
+        f"(julianday({compiler.process(end, **kw)}) - "
+        f"julianday({compiler.process(start, **kw)})) * 86400.0"
+    )
 
 
 class AbstractBase(Base):
@@ -19,10 +70,17 @@ class AbstractBase(Base):
     fully_invested: bool = Column(Boolean, default=False, nullable=False)
     create_date: datetime = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        default=stored_utc_now_default,
         nullable=False,
     )
     close_date: Optional[datetime] = Column(DateTime, nullable=True)
+    version_id: int = Column(
+        Integer, nullable=False, server_default=text("1")
+    )
+
+    @declared_attr
+    def __mapper_args__(cls) -> Dict[str, Any]:
+        return {"version_id_col": cls.version_id}
 
     __table_args__ = (
         CheckConstraint("full_amount > 0", name="check_full_amount_positive"),
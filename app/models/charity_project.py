@@ -1,7 +1,7 @@
-from sqlalchemy import CheckConstraint, Column, String, Text
+from sqlalchemy import CheckConstraint, Column, Index, String, Text, text
 
 from app import constants
-from app.models.base import AbstractBase
+from app.models.base import AbstractBase, open_rows_index, SecondsBetween
 
 
 class CharityProject(AbstractBase):
@@ -17,4 +17,13 @@ class CharityProject(AbstractBase):
         CheckConstraint(
             "length(description) >= 1", name="description_min_length"
         ),
+        open_rows_index("charityproject"),
     )
+
+
+Index(
+    "ix_charityproject_closed_fill_seconds",
+    SecondsBetween(CharityProject.create_date, CharityProject.close_date),
+    sqlite_where=text("fully_invested IS 1"),
+    postgresql_where=text("fully_invested IS true"),
+)
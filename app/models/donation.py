@@ -1,7 +1,7 @@
 from sqlalchemy import Column, ForeignKey, Integer, Text
 from sqlalchemy.orm import relationship
 
-from app.models.base import AbstractBase
+from app.models.base import AbstractBase, open_rows_index
 
 
 class Donation(AbstractBase):
@@ -9,6 +9,10 @@ class Donation(AbstractBase):
 
     __tablename__ = "donation"
 
-    user_id = Column(Integer, ForeignKey("user.id"))
+    user_id = Column(Integer, ForeignKey("user.id"), index=True)
     user = relationship("User", back_populates="donations")
     comment = Column(Text)
+
+    __table_args__ = AbstractBase.__table_args__ + (
+        open_rows_index("donation"),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Float, Integer
+
+from app import constants
+from app.core.db import Base
+
+
+class FundStats(Base):
+    """Сводные показатели фонда, одна строка с id=FUND_STATS_ID."""
+
+    __tablename__ = "fund_stats"
+
+    total_raised = Column(Integer, nullable=False, default=constants.ZERO)
+    total_invested = Column(Integer, nullable=False, default=constants.ZERO)
+    donations_count = Column(Integer, nullable=False, default=constants.ZERO)
+    projects_count = Column(Integer, nullable=False, default=constants.ZERO)
+    open_projects = Column(Integer, nullable=False, default=constants.ZERO)
+    closed_projects = Column(Integer, nullable=False, default=constants.ZERO)
+    fill_seconds = Column(Float, nullable=False, default=constants.ZERO)
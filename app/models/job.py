@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app import constants
+from app.core.db import Base, stored_utc_now_default
+
+
+class Job(Base):
+    """Фоновая задача и её состояние."""
+
+    kind = Column(String(constants.JOB_KIND_MAX_LENGTH), nullable=False)
+    status = Column(
+        String(constants.JOB_STATUS_MAX_LENGTH), nullable=False
+    )
+    progress = Column(Integer, nullable=False, default=constants.ZERO)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=stored_utc_now_default,
+        nullable=False,
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, PositiveInt
+
+
+class AllocationDB(BaseModel):
+    """Схема перевода средств пожертвования в проект."""
+
+    id: PositiveInt
+    donation_id: PositiveInt
+    charity_project_id: PositiveInt
+    amount: PositiveInt
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
@@ -1,6 +1,13 @@
+from datetime import datetime
 from typing import Any, Dict
 
-from pydantic import Field, PositiveInt, root_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    NonNegativeFloat,
+    PositiveInt,
+    root_validator,
+)
 
 from app import constants
 from app.schemas.base import BaseProjectAndDonationDB, CharityProjectBase
@@ -33,3 +40,17 @@ class CharityProjectDB(CharityProjectBase, BaseProjectAndDonationDB):
 
     class Config:
         orm_mode = True
+
+
+class CharityProjectFillTime(BaseModel):
+    """Схема закрытого проекта со временем наполнения."""
+
+    id: PositiveInt
+    name: str
+    full_amount: PositiveInt
+    create_date: datetime
+    close_date: datetime
+    fill_seconds: NonNegativeFloat
+
+    class Config:
+        orm_mode = True
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import PositiveInt
+from pydantic import BaseModel, PositiveInt
 
 from app.schemas.base import BaseProjectAndDonationDB, DonationBase
 
@@ -28,3 +28,10 @@ class DonationDB(DonationBase, BaseProjectAndDonationDB):
 
     class Config:
         orm_mode = True
+
+
+class DonationBulkResult(BaseModel):
+    """Итог массовой загрузки пожертвований."""
+
+    created: int
+    invested_amount: int
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt
+
+
+class FundStatsDB(BaseModel):
+    """Схема сводных показателей фонда."""
+
+    total_raised: NonNegativeInt
+    total_invested: NonNegativeInt
+    donations_count: NonNegativeInt
+    projects_count: NonNegativeInt
+    open_projects: NonNegativeInt
+    closed_projects: NonNegativeInt
+    fill_seconds: NonNegativeFloat
+    average_fill_seconds: Optional[NonNegativeFloat]
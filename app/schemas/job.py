@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, PositiveInt
+
+from app import constants
+from app.services.jobs import JobKind, JobStatus
+
+
+class JobCreate(BaseModel):
+    """Схема запуска фоновой задачи."""
+
+    kind: JobKind
+
+
+class JobDB(BaseModel):
+    """Схема фоновой задачи и её состояния."""
+
+    id: PositiveInt
+    kind: JobKind
+    status: JobStatus
+    progress: int = Field(
+        ..., ge=constants.ZERO, le=constants.JOB_PROGRESS_DONE
+    )
+    result: Optional[str]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        orm_mode = True
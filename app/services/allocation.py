@@ -0,0 +1,72 @@
+from bisect import bisect_left
+from itertools import accumulate
+from typing import List, NamedTuple, Sequence, Tuple
+
+from app import constants
+
+
+class FillDiff(NamedTuple):
+    """Как сумма ложится на очередь остатков.
+
+    Первые filled элементов заполняются полностью, элемент с индексом
+    filled получает partial (0 — не затрагивается), used — вся
+    распределённая сумма.
+    """
+
+    filled: int
+    partial: int
+    used: int
+
+
+def fill_prefix(total: int, remaining: Sequence[int]) -> FillDiff:
+    """Распределить total по очереди остатков remaining в порядке FIFO.
+
+    Граница заполнения ищется бинарным поиском по накопленным суммам,
+    без прохода по объектам с пересчётом каждого.
+    """
+    total = max(total, constants.ZERO)
+    cumulative = list(accumulate(remaining, initial=constants.ZERO))
+    if total >= cumulative[-1]:
+        return FillDiff(len(remaining), constants.ZERO, cumulative[-1])
+    filled = bisect_left(cumulative, total, 1) - 1
+    if total == cumulative[filled + 1]:
+        return FillDiff(filled + 1, constants.ZERO, total)
+    return FillDiff(filled, total - cumulative[filled], total)
+
+
+def expand_fill(diff: FillDiff, remaining: Sequence[int]) -> List[int]:
+    """Развернуть FillDiff в список вложений по каждому элементу."""
+    increments = list(remaining[:diff.filled])
+    increments += [constants.ZERO] * (len(remaining) - diff.filled)
+    if diff.partial:
+        increments[diff.filled] = diff.partial
+    return increments
+
+
+def match_queues(
+    left: Sequence[int], right: Sequence[int]
+) -> List[Tuple[int, int, int]]:
+    """Сопоставить две очереди остатков в порядке FIFO.
+
+    Возвращает тройки (индекс в left, индекс в right, сумма) в порядке
+    распределения: так средства пожертвований ложатся на проекты.
+    """
+    matches: List[Tuple[int, int, int]] = []
+    left_index = right_index = constants.ZERO
+    left_rest = left[0] if left else constants.ZERO
+    right_rest = right[0] if right else constants.ZERO
+    while left_index < len(left) and right_index < len(right):
+        amount = min(left_rest, right_rest)
+        if amount > constants.ZERO:
+            matches.append((left_index, right_index, amount))
+        left_rest -= amount
+        right_rest -= amount
+        if left_rest <= constants.ZERO:
+            left_index += 1
+            if left_index < len(left):
+                left_rest = left[left_index]
+        if right_rest <= constants.ZERO:
+            right_index += 1
+            if right_index < len(right):
+                right_rest = right[right_index]
+    return matches
@@ -0,0 +1,102 @@
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CharityProject, Donation
+from app.services.fund_stats import apply_stats_delta, StatsDelta
+from app.services.invested import (
+    apply_source_updates,
+    open_sources_query,
+    record_transfers,
+    remaining_amounts,
+    source_updates,
+    SourceUpdate,
+)
+
+
+class RebalancePlan(NamedTuple):
+    """Распределения между открытыми объектами и их новые состояния."""
+
+    allocations: List[Tuple[int, int, int]]
+    donation_updates: List[SourceUpdate]
+    project_updates: List[SourceUpdate]
+
+
+def match_queues(
+    left: Sequence[int], right: Sequence[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Сопоставить две очереди остатков в порядке FIFO.
+
+    Векторный аналог app.services.allocation.match_queues: границы
+    отрезков — объединение накопленных сумм обеих очередей, владелец
+    каждого отрезка находится через searchsorted. Возвращает массивы
+    индексов в left, индексов в right и сумм.
+    """
+    left_cumsum = np.cumsum(np.asarray(left, dtype=np.int64))
+    right_cumsum = np.cumsum(np.asarray(right, dtype=np.int64))
+    total = min(
+        left_cumsum[-1] if left_cumsum.size else 0,
+        right_cumsum[-1] if right_cumsum.size else 0,
+    )
+    ends = np.union1d(left_cumsum, right_cumsum)
+    ends = ends[(ends > 0) & (ends <= total)]
+    starts = np.concatenate(([0], ends)).astype(np.int64)[:-1]
+    return (
+        np.searchsorted(left_cumsum, starts, side="right"),
+        np.searchsorted(right_cumsum, starts, side="right"),
+        ends - starts,
+    )
+
+
+def increments_by_index(
+    indexes: np.ndarray, amounts: np.ndarray, size: int
+) -> List[int]:
+    """Суммарное вложение по каждому объекту очереди."""
+    increments = np.zeros(size, dtype=np.int64)
+    np.add.at(increments, indexes, amounts)
+    return increments.tolist()
+
+
+async def plan_rebalance(session: AsyncSession) -> RebalancePlan:
+    """Сопоставить все открытые пожертвования и проекты из БД."""
+    donations = (await session.execute(open_sources_query(Donation))).all()
+    projects = (
+        await session.execute(open_sources_query(CharityProject))
+    ).all()
+    donation_indexes, project_indexes, amounts = match_queues(
+        remaining_amounts(donations), remaining_amounts(projects)
+    )
+    donation_ids = np.array([row.id for row in donations], dtype=np.int64)
+    project_ids = np.array([row.id for row in projects], dtype=np.int64)
+    return RebalancePlan(
+        list(
+            zip(
+                donation_ids[donation_indexes].tolist(),
+                project_ids[project_indexes].tolist(),
+                amounts.tolist(),
+            )
+        ),
+        source_updates(
+            donations,
+            increments_by_index(donation_indexes, amounts, len(donations)),
+        ),
+        source_updates(
+            projects,
+            increments_by_index(project_indexes, amounts, len(projects)),
+        ),
+    )
+
+
+async def apply_rebalance(plan: RebalancePlan, session: AsyncSession) -> None:
+    """Записать новые состояния объектов из плана, не фиксируя транзакцию."""
+    await apply_source_updates(Donation, plan.donation_updates, session)
+    await apply_source_updates(CharityProject, plan.project_updates, session)
+    await record_transfers(Donation, plan.allocations, session)
+    delta = StatsDelta()
+    delta.invested(
+        Donation,
+        sum(amount for _, _, amount in plan.allocations),
+        plan.project_updates,
+    )
+    await apply_stats_delta(delta, session)
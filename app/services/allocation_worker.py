@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type, Union
+
+from sqlalchemy.orm import sessionmaker
+
+from app import constants
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models import CharityProject, Donation
+from app.services.invested import (
+    allocate,
+    invalidate_project_lists,
+    invest_with_retry,
+    sync_open_queues,
+)
+from app.services.open_queue import rebuild_open_queues
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AllocationCommand:
+    """Команда: создать объект и инвестировать его."""
+
+    model: Type[Union[CharityProject, Donation]]
+    data: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class AllocationWorker:
+    """Единственный писатель, который инвестирует объекты пачками.
+
+    Команды создания проектов и пожертвований попадают в ограниченную
+    очередь. Фоновая задача собирает пачку — команды, пришедшие за
+    batch_window секунд после первой, но не больше max_batch_size, —
+    и применяет её в одной транзакции с одним коммитом; вызывающий
+    код ждёт свой результат через future.
+    Очереди открытых объектов обновляются после каждой команды пачки,
+    чтобы следующая команда видела уже вложенные и созданные объекты.
+    Если пачка не записалась, очереди перестраиваются из БД, а команды
+    применяются по одной, чтобы ошибка одной команды не затрагивала
+    остальные.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_batch_size: int,
+        queue_size: int,
+        batch_window: float = constants.ZERO,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запустить фоновую задачу обработки команд."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить обработку; необработанные команды отменяются."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+
+    async def submit(
+        self,
+        model: Type[Union[CharityProject, Donation]],
+        data: Dict[str, Any],
+    ) -> Union[CharityProject, Donation]:
+        """Поставить создание объекта в очередь и дождаться результата."""
+        if not self.running:
+            raise RuntimeError("Обработчик распределений не запущен.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(AllocationCommand(model, data, future))
+        return await future
+
+    async def _next_batch(self) -> List[AllocationCommand]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= constants.ZERO:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            batch = [command for command in batch if not command.future.done()]
+            if batch:
+                await self._apply(batch)
+
+    async def _apply(self, batch: List[AllocationCommand]) -> None:
+        try:
+            async with self.session_factory() as session:
+                targets, allocations = [], []
+                for command in batch:
+                    target = command.model(**command.data)
+                    allocation = await allocate(target, session)
+                    sync_open_queues([allocation])
+                    allocations.append(allocation)
+                    targets.append(target)
+                await session.commit()
+        except Exception as error:
+            logger.warning(
+                "Пачка из %s команд не записана (%s), применяю по одной.",
+                len(batch),
+                error,
+            )
+            await self._rebuild_open_queues()
+            for command in batch:
+                await self._apply_one(command)
+            return
+        await invalidate_project_lists(allocations)
+        for command, target in zip(batch, targets):
+            if not command.future.done():
+                command.future.set_result(target)
+
+    async def _rebuild_open_queues(self) -> None:
+        if not settings.open_queue_enabled:
+            return
+        async with self.session_factory() as session:
+            await rebuild_open_queues(session)
+
+    async def _apply_one(self, command: AllocationCommand) -> None:
+        async with self.session_factory() as session:
+
+            async def prepare() -> Union[CharityProject, Donation]:
+                return command.model(**command.data)
+
+            try:
+                target = await invest_with_retry(prepare, session)
+            except Exception as error:
+                if not command.future.done():
+                    command.future.set_exception(error)
+                return
+        if not command.future.done():
+            command.future.set_result(target)
+
+
+allocation_worker = AllocationWorker(
+    AsyncSessionLocal,
+    settings.allocation_batch_max_size,
+    settings.allocation_queue_size,
+    settings.allocation_batch_window_ms / 1000,
+)
@@ -0,0 +1,233 @@
+import csv
+import io
+import json
+from typing import Any, Dict, List, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import constants
+from app.core.config import settings
+from app.core.db import stored_utc_now
+from app.models import CharityProject, Donation
+from app.schemas.charity_project import CharityProjectCreate
+from app.schemas.donation import DonationCreate
+from app.services.export import ExportFormat, MEDIA_TYPES
+from app.services.fund_stats import apply_stats_delta, StatsDelta
+from app.services.invested import (
+    allocate_bulk,
+    record_transfers,
+    source_entries,
+    SOURCE_MODELS,
+    SourceUpdate,
+)
+from app.services.open_queue import open_queues, OpenEntry
+from app.services.project_cache import project_list_cache
+
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+class BulkFormatError(ValueError):
+    """Тело запроса не разбирается как JSON-массив, NDJSON или CSV."""
+
+
+class BulkValidationError(ValueError):
+    """Строки массовой загрузки не прошли валидацию."""
+
+    def __init__(self, errors: List[Dict[str, Any]]) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+
+def parse_records(body: bytes, content_type: str) -> List[Dict[str, Any]]:
+    """Разобрать тело запроса в список записей по его Content-Type.
+
+    text/csv — CSV с заголовком, application/x-ndjson — JSON-объект
+    в каждой строке, иначе — JSON-массив объектов. Пустые значения
+    CSV считаются отсутствующими.
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+        if media_type == MEDIA_TYPES[ExportFormat.csv]:
+            return [
+                {key: value or None for key, value in row.items()}
+                for row in csv.DictReader(io.StringIO(text))
+            ]
+        if media_type == MEDIA_TYPES[ExportFormat.ndjson]:
+            return [
+                json.loads(line) for line in text.splitlines() if line.strip()
+            ]
+        records = json.loads(text)
+    except (UnicodeDecodeError, ValueError, csv.Error) as error:
+        raise BulkFormatError(str(error))
+    if not isinstance(records, list):
+        raise BulkFormatError("Ожидается JSON-массив объектов.")
+    return records
+
+
+def validate_records(
+    schema: Type[SchemaType], records: List[Any]
+) -> List[SchemaType]:
+    """Проверить все записи схемой и собрать ошибки с номерами строк."""
+    objs: List[SchemaType] = []
+    errors: List[Dict[str, Any]] = []
+    for number, record in enumerate(records, 1):
+        try:
+            objs.append(schema.parse_obj(record))
+        except ValidationError as error:
+            errors.append({"row": number, "errors": error.errors()})
+    if errors:
+        raise BulkValidationError(errors)
+    return objs
+
+
+async def insert_rows(
+    model: Type[Union[CharityProject, Donation]],
+    rows: List[Dict[str, Any]],
+    session: AsyncSession,
+) -> List[int]:
+    """Записать строки многострочными INSERT по BULK_INSERT_CHUNK_SIZE.
+
+    Возвращает ID записанных строк в порядке rows. Где есть RETURNING,
+    ID возвращает сам INSERT; в SQLite строки одного INSERT получают
+    подряд идущие rowid под блокировкой записи, и они восстанавливаются
+    по lastrowid.
+    """
+    table = model.__table__
+    connection = await session.connection()
+    returning = connection.dialect.implicit_returning
+    ids: List[int] = []
+    for start in range(0, len(rows), constants.BULK_INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + constants.BULK_INSERT_CHUNK_SIZE]
+        statement = insert(table).values(chunk)
+        if returning:
+            result = await session.execute(statement.returning(table.c.id))
+            ids.extend(result.scalars().all())
+        else:
+            result = await session.execute(statement)
+            ids.extend(
+                range(result.lastrowid - len(chunk) + 1, result.lastrowid + 1)
+            )
+    return ids
+
+
+async def import_donations(
+    donations: List[DonationCreate],
+    user_id: int,
+    session: AsyncSession,
+) -> Tuple[List[int], List[SourceUpdate], List[OpenEntry]]:
+    """Записать пожертвования и инвестировать их в текущей транзакции.
+
+    Все пожертвования распределяются одним проходом по открытым
+    проектам и записываются уже с итоговыми суммами. Возвращает
+    вложенные суммы, новые состояния проектов и снимки записанных
+    пожертвований для очереди открытых объектов.
+    """
+    invested, updates, transfers = await allocate_bulk(
+        Donation, [donation.full_amount for donation in donations], session
+    )
+    now = stored_utc_now(session.get_bind().dialect)
+    close_date = now.replace(tzinfo=None)
+    rows = []
+    for donation, invested_amount in zip(donations, invested):
+        fully_invested = invested_amount >= donation.full_amount
+        rows.append(
+            {
+                **donation.dict(),
+                "user_id": user_id,
+                "invested_amount": invested_amount,
+                "fully_invested": fully_invested,
+                "create_date": now,
+                "close_date": close_date if fully_invested else None,
+            }
+        )
+    donation_ids = await insert_rows(Donation, rows, session)
+    delta = StatsDelta()
+    delta.created(Donation, [donation.full_amount for donation in donations])
+    delta.invested(Donation, sum(invested), updates)
+    await apply_stats_delta(delta, session)
+    await record_transfers(
+        Donation,
+        [
+            (donation_ids[index], project_id, amount)
+            for index, project_id, amount in transfers
+        ],
+        session,
+    )
+    entries = [
+        OpenEntry(donation_id, donation.full_amount - invested_amount, now)
+        for donation_id, donation, invested_amount in zip(
+            donation_ids, donations, invested
+        )
+    ]
+    return invested, updates, entries
+
+
+async def create_projects(
+    charity_projects: List[CharityProjectCreate],
+    session: AsyncSession,
+) -> Tuple[List[CharityProject], List[SourceUpdate]]:
+    """Создать проекты и инвестировать в них в текущей транзакции.
+
+    Открытые пожертвования распределяются по проектам в порядке
+    создания одним проходом.
+    """
+    invested, updates, transfers = await allocate_bulk(
+        CharityProject,
+        [charity_project.full_amount for charity_project in charity_projects],
+        session,
+    )
+    now = stored_utc_now(session.get_bind().dialect)
+    close_date = now.replace(tzinfo=None)
+    projects = []
+    for charity_project, invested_amount in zip(charity_projects, invested):
+        fully_invested = invested_amount >= charity_project.full_amount
+        projects.append(
+            CharityProject(
+                **charity_project.dict(),
+                invested_amount=invested_amount,
+                fully_invested=fully_invested,
+                create_date=now,
+                close_date=close_date if fully_invested else None,
+            )
+        )
+    session.add_all(projects)
+    await session.flush()
+    delta = StatsDelta()
+    delta.created(
+        CharityProject, [project.full_amount for project in projects]
+    )
+    delta.invested(CharityProject, sum(invested), updates)
+    for project in projects:
+        if project.fully_invested:
+            delta.closed(project.create_date, project.close_date)
+    await apply_stats_delta(delta, session)
+    await record_transfers(
+        CharityProject,
+        [
+            (projects[index].id, donation_id, amount)
+            for index, donation_id, amount in transfers
+        ],
+        session,
+    )
+    return projects, updates
+
+
+async def publish_import(
+    model: Type[Union[CharityProject, Donation]],
+    updates: List[SourceUpdate],
+    entries: List[OpenEntry],
+) -> None:
+    """Обновить кэш и очереди открытых объектов после массовой записи.
+
+    entries — снимки созданных объектов.
+    """
+    if model is CharityProject or updates:
+        await project_list_cache.invalidate()
+    if not settings.open_queue_enabled:
+        return
+    open_queues[SOURCE_MODELS[model]].sync(source_entries(updates))
+    open_queues[model].sync(entries)
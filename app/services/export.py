@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app import constants
+
+
+class ExportFormat(str, Enum):
+    """Формат выгрузки."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def json_default(value: Any) -> str:
+    """Сериализация значений, которые не поддерживает json."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def format_chunk(
+    rows: Sequence[Any], keys: Sequence[str], export_format: ExportFormat
+) -> str:
+    """Сериализовать пачку строк в NDJSON или CSV."""
+    if export_format is ExportFormat.ndjson:
+        return "".join(
+            json.dumps(dict(zip(keys, row)), default=json_default) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_query(
+    query: Select,
+    export_format: ExportFormat,
+    session: AsyncSession,
+) -> AsyncIterator[bytes]:
+    """Построчно выгрузить результат запроса через серверный курсор."""
+    keys = list(query.selected_columns.keys())
+    if export_format is ExportFormat.csv:
+        yield format_chunk([keys], keys, export_format).encode()
+    result = await session.stream(query)
+    async for rows in result.partitions(constants.EXPORT_CHUNK_SIZE):
+        yield format_chunk(rows, keys, export_format).encode()
+
+
+def stream_export(
+    columns: Sequence[Any],
+    export_format: ExportFormat,
+    session: AsyncSession,
+) -> AsyncIterator[bytes]:
+    """Построчно выгрузить колонки по возрастанию первой из них."""
+    return stream_query(
+        select(*columns).order_by(columns[0]), export_format, session
+    )
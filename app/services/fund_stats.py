@@ -0,0 +1,206 @@
+import math
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple, Type, Union
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import constants
+from app.models import CharityProject, Donation, FundStats
+from app.models.base import SecondsBetween
+
+
+def as_utc(value: datetime) -> datetime:
+    """Привести дату к UTC без tzinfo, как она хранится в SQLite."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class StatsDelta:
+    """Изменение сводных показателей в рамках одной транзакции."""
+
+    total_raised: int = constants.ZERO
+    total_invested: int = constants.ZERO
+    donations_count: int = constants.ZERO
+    projects_count: int = constants.ZERO
+    open_projects: int = constants.ZERO
+    closed_projects: int = constants.ZERO
+    fill_seconds: float = constants.ZERO
+
+    def created(
+        self,
+        model: Type[Union[CharityProject, Donation]],
+        full_amounts: Iterable[int],
+    ) -> None:
+        """Учесть новые открытые проекты или пожертвования."""
+        full_amounts = list(full_amounts)
+        if model is Donation:
+            self.donations_count += len(full_amounts)
+            self.total_raised += sum(full_amounts)
+        else:
+            self.projects_count += len(full_amounts)
+            self.open_projects += len(full_amounts)
+
+    def closed(self, create_date: datetime, close_date: datetime) -> None:
+        """Учесть закрытие проекта."""
+        self.open_projects -= 1
+        self.closed_projects += 1
+        self.fill_seconds += (
+            as_utc(close_date) - as_utc(create_date)
+        ).total_seconds()
+
+    def invested(
+        self,
+        model: Type[Union[CharityProject, Donation]],
+        amount: int,
+        updates: List[Any],
+    ) -> None:
+        """Учесть распределение в новые объекты model из источников.
+
+        updates — новые состояния источников (SourceUpdate); закрытые
+        источники-проекты учитываются как закрытые проекты.
+        """
+        self.total_invested += amount
+        if model is not Donation:
+            return
+        for source in updates:
+            if source.fully_invested:
+                self.closed(source.create_date, source.close_date)
+
+    def __bool__(self) -> bool:
+        return any(asdict(self).values())
+
+
+async def apply_stats_delta(delta: StatsDelta, session: AsyncSession) -> None:
+    """Атомарно прибавить изменения к строке сводных показателей."""
+    if not delta:
+        return
+    values = asdict(delta)
+    table = FundStats.__table__
+    result = await session.execute(
+        update(table)
+        .where(table.c.id == constants.FUND_STATS_ID)
+        .values(
+            {
+                name: table.c[name] + value
+                for name, value in values.items()
+                if value
+            }
+        )
+    )
+    if result.rowcount == constants.ZERO:
+        await session.execute(
+            insert(table).values(id=constants.FUND_STATS_ID, **values)
+        )
+
+
+async def compute_fund_stats(session: AsyncSession) -> Dict[str, Any]:
+    """Посчитать сводные показатели заново по таблицам проектов и донатов."""
+    donations = (
+        await session.execute(
+            select(
+                func.coalesce(func.sum(Donation.full_amount), 0),
+                func.coalesce(func.sum(Donation.invested_amount), 0),
+                func.count(Donation.id),
+            )
+        )
+    ).one()
+    closed = CharityProject.fully_invested.is_(True)
+    projects = (
+        await session.execute(
+            select(
+                func.count(CharityProject.id),
+                func.coalesce(func.sum(case((closed, 0), else_=1)), 0),
+                func.coalesce(func.sum(case((closed, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (
+                                closed,
+                                SecondsBetween(
+                                    CharityProject.create_date,
+                                    CharityProject.close_date,
+                                ),
+                            ),
+                            else_=0,
+                        )
+                    ),
+                    0,
+                ),
+            )
+        )
+    ).one()
+    return dict(
+        total_raised=donations[0],
+        total_invested=donations[1],
+        donations_count=donations[2],
+        projects_count=projects[0],
+        open_projects=projects[1],
+        closed_projects=projects[2],
+        fill_seconds=float(projects[3]),
+    )
+
+
+async def get_fund_stats(session: AsyncSession) -> Dict[str, Any]:
+    """Прочитать сохранённые сводные показатели по первичному ключу."""
+    stats = await session.get(FundStats, constants.FUND_STATS_ID)
+    return {
+        name: getattr(stats, name) if stats is not None else default
+        for name, default in asdict(StatsDelta()).items()
+    }
+
+
+async def rebuild_fund_stats(session: AsyncSession) -> Dict[str, Any]:
+    """Пересчитать сводные показатели с нуля, не фиксируя транзакцию."""
+    values = await compute_fund_stats(session)
+    table = FundStats.__table__
+    result = await session.execute(
+        update(table)
+        .where(table.c.id == constants.FUND_STATS_ID)
+        .values(**values)
+    )
+    if result.rowcount == constants.ZERO:
+        await session.execute(
+            insert(table).values(id=constants.FUND_STATS_ID, **values)
+        )
+    return values
+
+
+async def find_stats_drift(
+    session: AsyncSession,
+) -> Dict[str, Tuple[Any, Any]]:
+    """Сравнить сохранённые показатели с пересчитанными.
+
+    Возвращает расходящиеся поля: имя -> (сохранено, должно быть).
+    """
+    stored = await get_fund_stats(session)
+    actual = await compute_fund_stats(session)
+    drift = {}
+    for name, value in actual.items():
+        if name == "fill_seconds":
+            if math.isclose(
+                stored[name],
+                value,
+                abs_tol=constants.FUND_STATS_FILL_TOLERANCE,
+            ):
+                continue
+        elif stored[name] == value:
+            continue
+        drift[name] = (stored[name], value)
+    return drift
+
+
+def stats_summary(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Показатели для ответа API со средним временем наполнения."""
+    closed_projects = values["closed_projects"]
+    return dict(
+        values,
+        average_fill_seconds=(
+            values["fill_seconds"] / closed_projects
+            if closed_projects
+            else None
+        ),
+    )
@@ -1,57 +1,522 @@
+import asyncio
+import random
 from datetime import datetime, timezone
-from typing import List, Union
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql import Select
 
 from app import constants
-from app.models import CharityProject, Donation
+from app.core.config import settings
+from app.core.db import utc_now
+from app.core.metrics import (
+    allocation_amount_histogram,
+    allocation_scanned_histogram,
+    allocation_updated_histogram,
+)
+from app.crud.base import refresh_expired
+from app.models import Allocation, CharityProject, Donation
+from app.services.allocation import expand_fill, fill_prefix, match_queues
+from app.services.fund_stats import apply_stats_delta, StatsDelta
+from app.services.open_queue import open_queues, OpenEntry
+from app.services.project_cache import project_list_cache
+
+
+T = TypeVar("T")
+
+SOURCE_MODELS: Dict[
+    Type[Union[CharityProject, Donation]],
+    Type[Union[CharityProject, Donation]],
+] = {
+    CharityProject: Donation,
+    Donation: CharityProject,
+}
+
+
+class AllocationConflict(Exception):
+    """Открытый объект изменён конкурентной транзакцией."""
+
+
+class SourceUpdate(NamedTuple):
+    """Новое состояние открытого объекта после инвестирования."""
+
+    id: int
+    full_amount: int
+    invested_amount: int
+    create_date: datetime
+    close_date: Optional[datetime]
+    version_id: int
+
+    @property
+    def fully_invested(self) -> bool:
+        return self.invested_amount >= self.full_amount
 
 
 def close_if_fully_invested(obj: Union[CharityProject, Donation]) -> None:
     """Закрывает объект, если полностью инвестирован."""
     if obj.invested_amount >= obj.full_amount and not obj.fully_invested:
         obj.fully_invested = True
-        obj.close_date = datetime.now(timezone.utc)
+        obj.close_date = utc_now()
 
 
-async def get_open_projects(session: AsyncSession) -> List[CharityProject]:
-    """Возвращает список открытых проектов."""
-    result = await session.execute(
-        select(CharityProject)
-        .where(CharityProject.fully_invested.is_(False))
-        .order_by(CharityProject.create_date)
+def source_columns(model: Type[Union[CharityProject, Donation]]) -> tuple:
+    """Колонки открытого объекта, нужные для инвестирования."""
+    return (
+        model.id,
+        model.full_amount,
+        model.invested_amount,
+        model.create_date,
+        model.version_id,
     )
-    return result.scalars().all()
 
 
-async def get_open_donations(session: AsyncSession) -> List[Donation]:
-    """Возвращает список открытых пожертвований."""
-    result = await session.execute(
-        select(Donation)
-        .where(Donation.fully_invested.is_(False))
-        .order_by(Donation.create_date)
+def remaining_amounts(sources: List[Row]) -> List[int]:
+    """Остатки источников до полного инвестирования."""
+    return [source.full_amount - source.invested_amount for source in sources]
+
+
+def open_sources_query(model: Type[Union[CharityProject, Donation]]) -> Select:
+    """Запрос открытых объектов в порядке очереди инвестирования.
+
+    На бэкендах с блокировкой строк выбранные строки блокируются
+    до конца транзакции, в SQLite FOR UPDATE не выводится.
+    """
+    return (
+        select(*source_columns(model))
+        .where(model.fully_invested.is_(False))
+        .order_by(model.create_date, model.id)
+        .with_for_update()
+    )
+
+
+async def get_open_prefix(
+    model: Type[Union[CharityProject, Donation]],
+    amount: int,
+    session: AsyncSession,
+) -> List[Row]:
+    """Возвращает минимальный префикс открытых объектов, покрывающий amount.
+
+    Записи читаются keyset-пачками удваивающегося размера по
+    (create_date, id), поэтому маленькая сумма не загружает в сессию
+    весь набор открытых объектов.
+    """
+    rows: List[Row] = []
+    query = open_sources_query(model)
+    batch_size = constants.OPEN_PREFIX_BATCH_SIZE
+    while amount > constants.ZERO:
+        batch_query = query.limit(batch_size)
+        if rows:
+            last = rows[-1]
+            batch_query = batch_query.where(
+                tuple_(model.create_date, model.id) >
+                tuple_(last.create_date, last.id)
+            )
+        batch = (await session.execute(batch_query)).all()
+        for row in batch:
+            rows.append(row)
+            amount -= row.full_amount - row.invested_amount
+            if amount <= constants.ZERO:
+                break
+        if len(batch) < batch_size:
+            break
+        batch_size *= 2
+    return rows
+
+
+async def get_open_sources(
+    target: Union[CharityProject, Donation],
+    session: AsyncSession,
+) -> List[Row]:
+    """Возвращает открытые объекты, из которых инвестируется target."""
+    return await find_open_sources(
+        SOURCE_MODELS[type(target)],
+        target.full_amount - target.invested_amount,
+        session,
     )
-    return result.scalars().all()
+
+
+async def find_open_sources(
+    model: Type[Union[CharityProject, Donation]],
+    amount: int,
+    session: AsyncSession,
+) -> List[Row]:
+    """Возвращает открытые объекты model, покрывающие сумму amount.
+
+    Очередь открытых объектов может отставать от БД (другой процесс,
+    ребалансировка), поэтому закрытые строки отбрасываются, а если
+    строки из очереди не покрывают amount, источники читаются из БД.
+    """
+    if not settings.open_queue_enabled:
+        return await get_open_prefix(model, amount, session)
+    ids = open_queues[model].take(amount)
+    rows: List[Row] = []
+    if ids:
+        result = await session.execute(
+            select(*source_columns(model))
+            .where(model.id.in_(ids))
+            .where(model.fully_invested.is_(False))
+            .order_by(model.create_date, model.id)
+            .with_for_update()
+        )
+        rows = result.all()
+    if sum(remaining_amounts(rows)) < amount:
+        return await get_open_prefix(model, amount, session)
+    return rows
+
+
+def source_updates(
+    sources: List[Row],
+    increments: List[int],
+) -> List[SourceUpdate]:
+    """Новые состояния источников, в которые вложены средства.
+
+    Все источники, закрытые одним распределением, получают общую
+    дату закрытия.
+    """
+    updates: List[SourceUpdate] = []
+    close_date: Optional[datetime] = None
+    for source, increment in zip(sources, increments):
+        if increment <= constants.ZERO:
+            continue
+        invested_amount = source.invested_amount + increment
+        source_close_date = None
+        if invested_amount >= source.full_amount:
+            close_date = close_date or utc_now()
+            source_close_date = close_date
+        updates.append(
+            SourceUpdate(
+                source.id,
+                source.full_amount,
+                invested_amount,
+                source.create_date,
+                source_close_date,
+                source.version_id,
+            )
+        )
+    return updates
+
+
+def observe_allocation(
+    model: Type[Union[CharityProject, Donation]],
+    scanned: int,
+    updated: int,
+    amount: int,
+) -> None:
+    """Учесть одно распределение в метриках процесса."""
+    labels = (model.__tablename__,)
+    allocation_scanned_histogram.observe(labels, scanned)
+    allocation_updated_histogram.observe(labels, updated)
+    allocation_amount_histogram.observe(labels, amount)
 
 
 def invest_funds(
     target: Union[CharityProject, Donation],
-    sources: List[Union[CharityProject, Donation]],
+    sources: List[Row],
+) -> List[SourceUpdate]:
+    """Распределяет средства между новым объектом и списком открытых.
+
+    Меняет target на месте и возвращает новые состояния источников,
+    в которые были вложены средства.
+    """
+    remaining = remaining_amounts(sources)
+    diff = fill_prefix(target.full_amount - target.invested_amount, remaining)
+    if diff.used > constants.ZERO:
+        target.invested_amount += diff.used
+        close_if_fully_invested(target)
+    touched = diff.filled + 1
+    updates = source_updates(
+        sources[:touched], expand_fill(diff, remaining[:touched])
+    )
+    observe_allocation(type(target), len(sources), len(updates), diff.used)
+    return updates
+
+
+def merge_funds(
+    amounts: List[int],
+    sources: List[Row],
+) -> Tuple[List[int], List[SourceUpdate], List[Tuple[int, int, int]]]:
+    """Распределяет средства нескольких новых объектов за один проход.
+
+    amounts — полные суммы новых объектов в порядке очереди. Результат
+    совпадает с последовательными вызовами invest_funds. Возвращает
+    вложенные суммы новых объектов, новые состояния источников и
+    переводы (индекс нового объекта, ID источника, сумма).
+    """
+    matches = match_queues(amounts, remaining_amounts(sources))
+    invested = [constants.ZERO] * len(amounts)
+    increments = [constants.ZERO] * len(sources)
+    for target_index, source_index, amount in matches:
+        invested[target_index] += amount
+        increments[source_index] += amount
+    return (
+        invested,
+        source_updates(sources, increments),
+        [
+            (target_index, sources[source_index].id, amount)
+            for target_index, source_index, amount in matches
+        ],
+    )
+
+
+async def apply_source_updates(
+    model: Type[Union[CharityProject, Donation]],
+    updates: List[SourceUpdate],
+    session: AsyncSession,
+) -> None:
+    """Записать новые состояния источников одним executemany UPDATE.
+
+    Каждая строка обновляется, только если её version_id не изменился
+    с момента чтения; иначе выбрасывается AllocationConflict.
+    """
+    if not updates:
+        return
+    table = model.__table__
+    result = await session.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .where(table.c.version_id == bindparam("b_version_id"))
+        .values(
+            invested_amount=bindparam("b_invested_amount"),
+            fully_invested=bindparam("b_fully_invested"),
+            close_date=bindparam("b_close_date"),
+            version_id=table.c.version_id + 1,
+        ),
+        [
+            {
+                "b_id": source.id,
+                "b_version_id": source.version_id,
+                "b_invested_amount": source.invested_amount,
+                "b_fully_invested": source.fully_invested,
+                "b_close_date": source.close_date,
+            }
+            for source in updates
+        ],
+    )
+    if result.rowcount != len(updates):
+        raise AllocationConflict(
+            f"{model.__name__}: изменено {result.rowcount} "
+            f"из {len(updates)} строк"
+        )
+
+
+async def record_transfers(
+    model: Type[Union[CharityProject, Donation]],
+    transfers: List[Tuple[int, int, int]],
+    session: AsyncSession,
 ) -> None:
-    """Распределяет средства между новым объектом и списком открытых."""
-    for source in sources:
-        invest_amount: int = min(
-            target.full_amount - target.invested_amount,
+    """Записать переводы в журнал распределений одним executemany.
+
+    transfers — тройки (ID нового объекта model, ID источника, сумма).
+    """
+    if not transfers:
+        return
+    created_at = datetime.now(timezone.utc)
+    rows = []
+    for target_id, source_id, amount in transfers:
+        donation_id, charity_project_id = (
+            (target_id, source_id)
+            if model is Donation
+            else (source_id, target_id)
+        )
+        rows.append(
+            {
+                "donation_id": donation_id,
+                "charity_project_id": charity_project_id,
+                "amount": amount,
+                "created_at": created_at,
+            }
+        )
+    await session.execute(insert(Allocation.__table__), rows)
+
+
+class AllocationResult(NamedTuple):
+    """Результат инвестирования одного объекта до коммита."""
+
+    target_model: Type[Union[CharityProject, Donation]]
+    target_entry: OpenEntry
+    updates: List[SourceUpdate]
+
+
+async def allocate(
+    target: Union[CharityProject, Donation],
+    session: AsyncSession,
+) -> AllocationResult:
+    """Инвестировать target в текущей транзакции, не фиксируя её.
+
+    target записывается до чтения источников: так транзакция сразу
+    становится пишущей и в SQLite распределения выполняются по очереди.
+    Сводные показатели фонда обновляются в той же транзакции; target
+    до вызова должен быть открыт.
+    """
+    updates: List[SourceUpdate] = []
+    transfers: List[Tuple[int, int, int]] = []
+    delta = StatsDelta()
+    if target.id is None:
+        delta.created(type(target), [target.full_amount])
+    session.add(target)
+    await session.flush()
+    if not target.fully_invested:
+        sources = await get_open_sources(target, session)
+        invested_before = {
+            source.id: source.invested_amount for source in sources
+        }
+        updates = invest_funds(target, sources)
+        transfers = [
+            (
+                target.id,
+                update.id,
+                update.invested_amount - invested_before[update.id],
+            )
+            for update in updates
+        ]
+    await apply_source_updates(SOURCE_MODELS[type(target)], updates, session)
+    await record_transfers(type(target), transfers, session)
+    delta.invested(
+        type(target), sum(amount for _, _, amount in transfers), updates
+    )
+    if isinstance(target, CharityProject) and target.fully_invested:
+        delta.closed(target.create_date, target.close_date)
+    await apply_stats_delta(delta, session)
+    await session.flush()
+    return AllocationResult(type(target), OpenEntry.from_obj(target), updates)
+
+
+async def allocate_bulk(
+    model: Type[Union[CharityProject, Donation]],
+    amounts: List[int],
+    session: AsyncSession,
+) -> Tuple[List[int], List[SourceUpdate], List[Tuple[int, int, int]]]:
+    """Инвестировать новые объекты model в текущей транзакции, не фиксируя.
+
+    amounts — полные суммы новых объектов в порядке создания; сами
+    объекты и переводы в журнал записывает вызывающий код по
+    результату merge_funds.
+    """
+    source_model = SOURCE_MODELS[model]
+    sources = await find_open_sources(source_model, sum(amounts), session)
+    invested, updates, transfers = merge_funds(amounts, sources)
+    observe_allocation(model, len(sources), len(updates), sum(invested))
+    await apply_source_updates(source_model, updates, session)
+    return invested, updates, transfers
+
+
+def source_entries(updates: List[SourceUpdate]) -> List[OpenEntry]:
+    """Снимки источников для очереди открытых объектов."""
+    return [
+        OpenEntry(
+            source.id,
             source.full_amount - source.invested_amount,
+            source.create_date,
         )
+        for source in updates
+    ]
 
-        if invest_amount <= constants.ZERO:
-            continue
 
-        for obj in (target, source):
-            obj.invested_amount += invest_amount
-            close_if_fully_invested(obj)
+def sync_open_queues(allocations: List[AllocationResult]) -> None:
+    """Перенести результаты распределений в очереди открытых объектов."""
+    if not settings.open_queue_enabled:
+        return
+    for allocation in allocations:
+        open_queues[allocation.target_model].sync([allocation.target_entry])
+        open_queues[SOURCE_MODELS[allocation.target_model]].sync(
+            source_entries(allocation.updates)
+        )
 
-        if target.fully_invested:
-            break
+
+async def invalidate_project_lists(
+    allocations: List[AllocationResult],
+) -> None:
+    """Сбросить кэш списка проектов, если распределения его изменили."""
+    if any(
+        allocation.target_model is CharityProject or allocation.updates
+        for allocation in allocations
+    ):
+        await project_list_cache.invalidate()
+
+
+async def publish_allocations(
+    allocations: List[AllocationResult],
+) -> None:
+    """Обновить кэш и очереди открытых объектов после коммита."""
+    await invalidate_project_lists(allocations)
+    sync_open_queues(allocations)
+
+
+async def invest(
+    target: Union[CharityProject, Donation],
+    session: AsyncSession,
+) -> Union[CharityProject, Donation]:
+    """Инвестировать target из открытых объектов и зафиксировать изменения."""
+    allocation = await allocate(target, session)
+    await session.commit()
+    await refresh_expired(target, session)
+    await publish_allocations([allocation])
+    return target
+
+
+def is_lock_error(error: OperationalError) -> bool:
+    """Проверить, что ошибка — временная блокировка базы SQLite."""
+    return constants.SQLITE_LOCKED_MESSAGE in str(error.orig)
+
+
+async def run_with_retry(
+    operation: Callable[[], Awaitable[T]],
+    session: AsyncSession,
+) -> T:
+    """Выполнить транзакцию operation, повторяя при конфликте версий.
+
+    Конфликтом также считается занятая база SQLite. После отката
+    транзакции и случайной экспоненциальной паузы operation
+    вызывается заново.
+    """
+    for attempt in range(1, constants.ALLOCATION_ATTEMPTS + 1):
+        try:
+            return await operation()
+        except (AllocationConflict, StaleDataError, OperationalError) as error:
+            if isinstance(error, OperationalError) and not is_lock_error(
+                error
+            ):
+                raise
+            await session.rollback()
+            if attempt == constants.ALLOCATION_ATTEMPTS:
+                raise AllocationConflict(
+                    "Не удалось распределить средства из-за "
+                    "конкурентных изменений."
+                )
+            await asyncio.sleep(
+                random.uniform(
+                    constants.ZERO,
+                    constants.ALLOCATION_RETRY_DELAY * 2**attempt,
+                )
+            )
+
+
+async def invest_with_retry(
+    prepare: Callable[[], Awaitable[Union[CharityProject, Donation]]],
+    session: AsyncSession,
+) -> Union[CharityProject, Donation]:
+    """Подготовить target и инвестировать, повторяя при конфликте версий.
+
+    При повторе prepare вызывается заново, чтобы пересоздать
+    или перечитать target.
+    """
+
+    async def operation() -> Union[CharityProject, Donation]:
+        return await invest(await prepare(), session)
+
+    return await run_with_retry(operation, session)
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app import constants
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, stored_utc_now
+from app.crud.allocation import allocation_crud
+from app.crud.base import refresh_expired
+from app.models import CharityProject, Donation, Job
+from app.services.fund_stats import rebuild_fund_stats
+from app.services.reports import fastest_projects_query, write_report
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobKind(str, Enum):
+    """Вид фоновой задачи."""
+
+    fastest_projects_report = "fastest_projects_report"
+    fund_stats_rebuild = "fund_stats_rebuild"
+    allocation_reconcile = "allocation_reconcile"
+
+
+class JobStatus(str, Enum):
+    """Состояние фоновой задачи."""
+
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+ACTIVE_STATUSES = (JobStatus.pending, JobStatus.running)
+# Задачи, результат которых — имя файла в каталоге отчётов
+FILE_JOB_KINDS = (JobKind.fastest_projects_report,)
+
+
+@dataclass
+class JobContext:
+    """Окружение выполняемой задачи: её ID, сессии и каталог файлов."""
+
+    id: int
+    session_factory: sessionmaker
+    files_dir: Path
+    progress_percent: int = constants.ZERO
+
+    async def progress(self, done: int, total: int) -> None:
+        """Сохранить прогресс, если изменился процент выполнения."""
+        percent = (
+            done * constants.JOB_PROGRESS_DONE // total
+            if total
+            else constants.JOB_PROGRESS_DONE
+        )
+        if percent == self.progress_percent:
+            return
+        self.progress_percent = percent
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job).where(Job.id == self.id).values(progress=percent)
+            )
+            await session.commit()
+
+
+JobHandler = Callable[[JobContext], Awaitable[Optional[str]]]
+
+
+async def export_fastest_projects(job: JobContext) -> str:
+    """Записать отчёт о быстрее всего закрытых проектах в CSV."""
+    file_name = f"{job.id}.csv"
+    await asyncio.to_thread(job.files_dir.mkdir, parents=True, exist_ok=True)
+    query = fastest_projects_query()
+    async with job.session_factory() as session:
+        total = await session.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+        await write_report(
+            query,
+            job.files_dir / file_name,
+            session,
+            partial(job.progress, total=total),
+        )
+    return file_name
+
+
+async def rebuild_stats(job: JobContext) -> str:
+    """Пересчитать сводные показатели фонда с нуля."""
+    async with job.session_factory() as session:
+        values = await rebuild_fund_stats(session)
+        await session.commit()
+    return json.dumps(values)
+
+
+async def reconcile_allocations(job: JobContext) -> str:
+    """Найти объекты, чьи вложенные суммы расходятся с журналом."""
+    models = (Donation, CharityProject)
+    unbalanced: Dict[str, Any] = {}
+    async with job.session_factory() as session:
+        for done, model in enumerate(models, start=constants.ONE):
+            unbalanced[model.__tablename__] = (
+                await allocation_crud.get_unbalanced_ids(model, session)
+            )
+            await job.progress(done, len(models))
+    return json.dumps(unbalanced)
+
+
+JOB_HANDLERS: Dict[JobKind, JobHandler] = {
+    JobKind.fastest_projects_report: export_fastest_projects,
+    JobKind.fund_stats_rebuild: rebuild_stats,
+    JobKind.allocation_reconcile: reconcile_allocations,
+}
+
+
+class JobRunner:
+    """Выполнение фоновых задач в текущем процессе.
+
+    Состояние задач хранится в таблице job, поэтому его можно узнать
+    из любого запроса. Одновременно выполняется не больше concurrency
+    задач, остальные ждут в статусе pending. Задачи не переживают
+    перезапуск: обработчик раз в heartbeat_interval секунд отмечает
+    свои активные задачи, а активные задачи без отметки дольше
+    stale_after секунд — чьи бы они ни были — помечает прерванными
+    при старте и при каждой отметке.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        concurrency: int,
+        files_dir: str,
+        heartbeat_interval: float = constants.JOB_HEARTBEAT_SECONDS,
+        stale_after: float = constants.JOB_STALE_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.files_dir = Path(files_dir)
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._semaphore is not None
+
+    async def start(self) -> None:
+        """Пометить прерванные задачи и начать принимать новые."""
+        if self.running:
+            return
+        await self._sweep()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._heartbeat = asyncio.create_task(self._beat())
+
+    async def stop(self) -> None:
+        """Перестать принимать задачи и отменить невыполненные."""
+        tasks = list(self._tasks.values())
+        if self._heartbeat is not None:
+            tasks.append(self._heartbeat)
+            self._heartbeat = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._semaphore = None
+
+    async def submit(self, kind: JobKind, session: AsyncSession) -> Job:
+        """Сохранить задачу и поставить её в очередь выполнения."""
+        if not self.running:
+            raise RuntimeError("Обработчик фоновых задач не запущен.")
+        job = Job(
+            kind=kind,
+            status=JobStatus.pending,
+            heartbeat_at=stored_utc_now(session.get_bind().dialect),
+        )
+        session.add(job)
+        await session.commit()
+        await refresh_expired(job, session)
+        self._tasks[job.id] = asyncio.create_task(self._run(job.id, kind))
+        return job
+
+    async def get(self, job_id: int, session: AsyncSession) -> Optional[Job]:
+        """Прочитать задачу."""
+        return await session.get(Job, job_id)
+
+    async def fail_orphans(self) -> int:
+        """Пометить прерванными активные задачи без свежей отметки.
+
+        Задачи этого процесса не трогаются. Сначала прерванные задачи
+        ищутся SELECT-ом, и UPDATE с блокировкой записи выполняется,
+        только если они есть. Возвращает число помеченных задач.
+        """
+        now = datetime.now(timezone.utc)
+        orphaned = (
+            Job.status.in_(ACTIVE_STATUSES),
+            or_(
+                Job.heartbeat_at.is_(None),
+                Job.heartbeat_at < now - timedelta(seconds=self.stale_after),
+            ),
+            Job.id.not_in(list(self._tasks)),
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(select(Job.id).where(*orphaned))
+            job_ids = result.scalars().all()
+            if not job_ids:
+                return constants.ZERO
+            result = await session.execute(
+                update(Job)
+                .where(Job.id.in_(job_ids), *orphaned)
+                .values(
+                    status=JobStatus.failed,
+                    error="Задача прервана: обработчик перестал отвечать.",
+                    finished_at=now,
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def _touch(self) -> None:
+        if not self._tasks:
+            return
+        await self._set_many(
+            list(self._tasks), heartbeat_at=datetime.now(timezone.utc)
+        )
+
+    async def _sweep(self) -> None:
+        try:
+            await self._touch()
+            await self.fail_orphans()
+        except Exception:
+            logger.exception("Не удалось отметить фоновые задачи")
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self._sweep()
+
+    async def _set_many(self, job_ids: List[int], **values: Any) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job).where(Job.id.in_(job_ids)).values(**values)
+            )
+            await session.commit()
+
+    async def _set(self, job_id: int, **values: Any) -> None:
+        await self._set_many([job_id], **values)
+
+    async def _run(self, job_id: int, kind: JobKind) -> None:
+        context = JobContext(job_id, self.session_factory, self.files_dir)
+        try:
+            async with self._semaphore:
+                await self._set(
+                    job_id,
+                    status=JobStatus.running,
+                    started_at=datetime.now(timezone.utc),
+                    heartbeat_at=datetime.now(timezone.utc),
+                )
+                result = await JOB_HANDLERS[kind](context)
+        except asyncio.CancelledError:
+            await self._set(
+                job_id,
+                status=JobStatus.failed,
+                error="Задача отменена при остановке приложения.",
+                finished_at=datetime.now(timezone.utc),
+            )
+            raise
+        except Exception as error:
+            logger.exception("Фоновая задача %s завершилась ошибкой", job_id)
+            await self._set(
+                job_id,
+                status=JobStatus.failed,
+                error=str(error),
+                finished_at=datetime.now(timezone.utc),
+            )
+        else:
+            await self._set(
+                job_id,
+                status=JobStatus.done,
+                progress=constants.JOB_PROGRESS_DONE,
+                result=result,
+                finished_at=datetime.now(timezone.utc),
+            )
+        finally:
+            self._tasks.pop(job_id, None)
+
+
+job_runner = JobRunner(
+    AsyncSessionLocal, settings.job_concurrency, settings.reports_dir
+)
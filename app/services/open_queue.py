@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Type, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import constants
+from app.models import CharityProject, Donation
+
+
+@dataclass
+class OpenEntry:
+    """Открытый объект: ID, остаток до полного инвестирования и дата."""
+
+    id: int
+    remaining: int
+    create_date: datetime
+
+    @classmethod
+    def from_obj(cls, obj: Union[CharityProject, Donation]) -> "OpenEntry":
+        """Снимок состояния объекта для очереди."""
+        return cls(
+            obj.id, obj.full_amount - obj.invested_amount, obj.create_date
+        )
+
+
+class OpenQueue:
+    """FIFO открытых объектов одной модели в порядке create_date.
+
+    Очередь живёт в памяти процесса: она перестраивается из БД при
+    старте приложения и обновляется после каждого коммита инвестирования.
+    """
+
+    def __init__(self, model: Type[Union[CharityProject, Donation]]):
+        """Инициализация пустой очереди для указанной модели."""
+        self.model = model
+        self._entries: "OrderedDict[int, OpenEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Перестроить очередь по открытым записям из БД."""
+        result = await session.execute(
+            select(
+                self.model.id,
+                self.model.full_amount - self.model.invested_amount,
+                self.model.create_date,
+            )
+            .where(self.model.fully_invested.is_(False))
+            .order_by(self.model.create_date, self.model.id)
+        )
+        self._entries = OrderedDict(
+            (row[0], OpenEntry(*row)) for row in result.all()
+        )
+
+    def take(self, amount: int) -> List[int]:
+        """Вернуть ID минимального префикса, покрывающего сумму."""
+        ids: List[int] = []
+        for entry in self._entries.values():
+            if amount <= constants.ZERO:
+                break
+            ids.append(entry.id)
+            amount -= entry.remaining
+        return ids
+
+    def sync(self, entries: Iterable[OpenEntry]) -> None:
+        """Привести очередь в соответствие со снимками сохранённых объектов."""
+        for new_entry in entries:
+            if new_entry.remaining <= constants.ZERO:
+                self._entries.pop(new_entry.id, None)
+                continue
+            entry = self._entries.get(new_entry.id)
+            if entry is None:
+                self._entries[new_entry.id] = new_entry
+            else:
+                entry.remaining = new_entry.remaining
+
+    def discard(self, obj_id: int) -> None:
+        """Удалить объект из очереди."""
+        self._entries.pop(obj_id, None)
+
+    def clear(self) -> None:
+        """Очистить очередь."""
+        self._entries.clear()
+
+
+open_queues: Dict[Type[Union[CharityProject, Donation]], OpenQueue] = {
+    CharityProject: OpenQueue(CharityProject),
+    Donation: OpenQueue(Donation),
+}
+
+
+async def rebuild_open_queues(session: AsyncSession) -> None:
+    """Перестроить очереди открытых проектов и пожертвований."""
+    for queue in open_queues.values():
+        await queue.rebuild(session)
@@ -0,0 +1,102 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import CacheNamespace
+from app.core.config import settings
+from app.schemas.charity_project import CharityProjectDB
+
+
+@dataclass
+class CachedPage:
+    """Сериализованная страница списка проектов."""
+
+    body: bytes
+    etag: str
+    link: Optional[str]
+
+    def to_response(self, if_none_match: Optional[str]) -> Response:
+        """Ответ с телом страницы либо 304, если ETag не изменился."""
+        headers = {"ETag": self.etag}
+        if self.link is not None:
+            headers["Link"] = self.link
+        if if_none_match is not None and (
+            self.etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        return Response(
+            content=self.body, media_type="application/json", headers=headers
+        )
+
+    def dump(self) -> bytes:
+        """Упаковать страницу для хранилища кэша."""
+        header = json.dumps({"etag": self.etag, "link": self.link})
+        return header.encode() + b"\n" + self.body
+
+    @classmethod
+    def load(cls, data: bytes) -> "CachedPage":
+        """Распаковать страницу из хранилища кэша."""
+        header, body = data.split(b"\n", 1)
+        return cls(body=body, **json.loads(header))
+
+
+class ProjectListCache:
+    """Кэш публичного списка проектов.
+
+    Ключ — проверенные параметры страницы (PageParams.as_query).
+    """
+
+    def __init__(self) -> None:
+        self.namespace = CacheNamespace(
+            "charity_project:list", settings.project_list_cache_ttl
+        )
+
+    async def version(self) -> Optional[int]:
+        """Версия кэша; читается до запроса проектов из БД."""
+        return await self.namespace.version()
+
+    async def get(
+        self, key: str, version: Optional[int] = None
+    ) -> Optional[CachedPage]:
+        """Вернуть страницу, если она есть в кэше."""
+        data = await self.namespace.get(key, version)
+        return None if data is None else CachedPage.load(data)
+
+    async def set(
+        self,
+        key: str,
+        projects: List[CharityProjectDB],
+        link: Optional[str],
+        version: Optional[int] = None,
+    ) -> CachedPage:
+        """Сериализовать страницу и сохранить её в кэше.
+
+        version — версия, прочитанная до запроса проектов: страница,
+        собранная до конкурентной инвалидации, не попадёт в новую версию.
+        """
+        body = json.dumps(
+            jsonable_encoder(projects),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        page = CachedPage(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            link=link,
+        )
+        await self.namespace.set(key, page.dump(), version)
+        return page
+
+    async def invalidate(self) -> None:
+        """Сбросить все страницы после изменения проектов."""
+        if settings.project_list_cache_enabled:
+            await self.namespace.invalidate()
+
+
+project_list_cache = ProjectListCache()
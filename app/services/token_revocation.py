@@ -0,0 +1,61 @@
+import time
+from typing import Any, Dict, Optional
+
+from app import constants
+
+
+class TokenRevocationList:
+    """Отозванные JWT в памяти процесса.
+
+    Токен отзывается по своему jti (выход из системы) или вместе со
+    всеми токенами пользователя, выпущенными до указанного момента
+    (смена прав или пароля). Записи хранятся, пока отозванные ими
+    токены не истекут сами; в другие процессы отзыв не передаётся.
+    """
+
+    def __init__(self, lifetime_seconds: int) -> None:
+        self.lifetime_seconds = lifetime_seconds
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def _purge(self, now: float) -> None:
+        self._tokens = {
+            jti: expires_at
+            for jti, expires_at in self._tokens.items()
+            if expires_at > now
+        }
+        self._users = {
+            user_id: issued_before
+            for user_id, issued_before in self._users.items()
+            if issued_before + self.lifetime_seconds > now
+        }
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        """Отозвать один токен до момента его истечения."""
+        self._purge(time.time())
+        self._tokens[jti] = expires_at
+
+    def revoke_user(
+        self, user_id: Any, issued_before: Optional[float] = None
+    ) -> None:
+        """Отозвать все токены пользователя, выпущенные до момента."""
+        now = time.time()
+        self._purge(now)
+        self._users[str(user_id)] = (
+            now if issued_before is None else issued_before
+        )
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """Проверить, отозван ли токен с такими утверждениями."""
+        if claims.get("jti") in self._tokens:
+            return True
+        issued_before = self._users.get(str(claims.get("user_id")))
+        return issued_before is not None and (
+            claims.get("iat", constants.ZERO) < issued_before
+        )
+
+
+revoked_tokens = TokenRevocationList(constants.JWT_LIFETIME_SECONDS)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+from typing import Optional
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import CacheNamespace
+from app.core.config import settings
+from app.models.user import User
+
+
+# Поля пользователя, которые хранятся в кэше; хэш пароля не кэшируется
+CACHED_FIELDS = tuple(
+    column.key
+    for column in User.__table__.columns
+    if column.key != "hashed_password"
+)
+
+
+class UserCache:
+    """Кэш пользователей, найденных по JWT.
+
+    Все пользователи хранятся в одном пространстве ключей, ключ — ID
+    пользователя и хэш токена с меткой пользователя. Изменение
+    пользователя удаляет метку и сбрасывает все его токены сразу.
+    """
+
+    def __init__(self) -> None:
+        self.namespace = CacheNamespace("user", settings.user_cache_ttl)
+
+    @staticmethod
+    def _key(user_id: int, token: str) -> str:
+        return f"{user_id}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    async def version(self, user_id: int) -> Optional[str]:
+        """Метка кэша пользователя; читается до запроса к БД.
+
+        None — кэш недоступен, и читать или сохранять пользователя
+        не нужно.
+        """
+        return await self.namespace.marker(str(user_id))
+
+    async def get(
+        self, user_id: int, token: str, version: Optional[str]
+    ) -> Optional[User]:
+        """Вернуть пользователя, если он есть в кэше.
+
+        Объект отсоединён от сессии, но его можно добавить в сессию
+        для изменения без повторного чтения из БД.
+        """
+        if version is None:
+            return None
+        data = await self.namespace.get(self._key(user_id, token), version)
+        if data is None:
+            return None
+        user = User(**json.loads(data))
+        make_transient_to_detached(user)
+        return user
+
+    async def set(
+        self, user: User, token: str, version: Optional[str]
+    ) -> None:
+        """Сохранить пользователя, найденного по токену.
+
+        version — метка, прочитанная до запроса пользователя из БД:
+        строка, прочитанная до конкурентного изменения, сохранится под
+        удалённой меткой и не будет отдана.
+        """
+        if version is None:
+            return
+        data = {field: getattr(user, field) for field in CACHED_FIELDS}
+        await self.namespace.set(
+            self._key(user.id, token), json.dumps(data).encode(), version
+        )
+
+    async def invalidate(self, user_id: int) -> None:
+        """Сбросить кэш пользователя после его изменения."""
+        if settings.user_cache_enabled:
+            await self.namespace.invalidate_group(str(user_id))
+
+
+user_cache = UserCache()
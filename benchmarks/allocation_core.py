@@ -0,0 +1,74 @@
+"""Поштучный цикл распределения против префиксных сумм и бинарного поиска.
+
+Новый объект покрывает половину открытых источников. Запуск из
+корня проекта:
+
+    python -m benchmarks.allocation_core
+"""
+
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from app.models import Donation
+from app.services.allocation import fill_prefix
+from app.services.invested import close_if_fully_invested, invest_funds
+
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+Source = namedtuple(
+    "Source", "id full_amount invested_amount create_date version_id"
+)
+
+
+def sequential_invest(target, sources) -> int:
+    """Прежний цикл: один источник за шаг, дата закрытия на каждом шаге."""
+    touched = 0
+    for source in sources:
+        invest_amount = min(
+            target.full_amount - target.invested_amount,
+            source.full_amount - source.invested_amount,
+        )
+        if invest_amount <= 0:
+            continue
+        target.invested_amount += invest_amount
+        close_if_fully_invested(target)
+        if source.invested_amount + invest_amount >= source.full_amount:
+            datetime.now(timezone.utc)
+        touched += 1
+        if target.fully_invested:
+            break
+    return touched
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    now = datetime.now(timezone.utc)
+    for size in SIZES:
+        sources = [Source(number, 10, 3, now, 1) for number in range(size)]
+        remaining = [7] * size
+        amount = 7 * size // 2
+
+        def new_target():
+            return Donation(
+                full_amount=amount, invested_amount=0, fully_invested=False
+            )
+
+        loop = timed(sequential_invest, new_target(), sources)
+        full = timed(invest_funds, new_target(), sources)
+        core = timed(fill_prefix, amount, remaining)
+        print(
+            f"{size:>9} rows: loop {loop * 1000:9.2f} ms, "
+            f"invest_funds {full * 1000:9.2f} ms, "
+            f"fill_prefix {core * 1000:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
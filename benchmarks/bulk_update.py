@@ -0,0 +1,114 @@
+"""Сравнение ORM flush и executemany UPDATE для результатов инвестирования.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.bulk_update
+"""
+
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+from app.models import CharityProject
+from app.services.invested import apply_source_updates, SourceUpdate
+
+
+SIZES = (10, 1_000, 50_000)
+
+
+async def fill(session: AsyncSession, size: int) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(
+        insert(CharityProject.__table__),
+        [
+            {
+                "name": f"project {number}",
+                "description": "benchmark",
+                "full_amount": 10,
+                "invested_amount": 0,
+                "fully_invested": False,
+                "create_date": now,
+            }
+            for number in range(size)
+        ],
+    )
+    await session.commit()
+
+
+async def orm_flush(session: AsyncSession) -> None:
+    projects = (await session.execute(select(CharityProject))).scalars()
+    now = datetime.now(timezone.utc)
+    for project in projects:
+        project.invested_amount = project.full_amount
+        project.fully_invested = True
+        project.close_date = now
+    await session.commit()
+
+
+async def bulk_update(session: AsyncSession) -> None:
+    rows = (
+        await session.execute(
+            select(
+                CharityProject.id,
+                CharityProject.full_amount,
+                CharityProject.create_date,
+                CharityProject.version_id,
+            )
+        )
+    ).all()
+    now = datetime.now(timezone.utc)
+    await apply_source_updates(
+        CharityProject,
+        [
+            SourceUpdate(
+                row.id,
+                row.full_amount,
+                row.full_amount,
+                row.create_date,
+                now,
+                row.version_id,
+            )
+            for row in rows
+        ],
+        session,
+    )
+    await session.commit()
+
+
+async def measure(method, size: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with session_factory() as session:
+            await fill(session, size)
+        async with session_factory() as session:
+            start = time.perf_counter()
+            await method(session)
+            elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return elapsed
+
+
+async def main() -> None:
+    print(f"{'rows':>8} {'orm flush, s':>14} {'executemany, s':>16}")
+    for size in SIZES:
+        orm_time = await measure(orm_flush, size)
+        bulk_time = await measure(bulk_update, size)
+        print(f"{size:>8} {orm_time:>14.4f} {bulk_time:>16.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Задержка и пропускная способность создания пожертвований.
+
+Сравнивает отдельную транзакцию на каждое пожертвование
+(invest_with_retry, как в POST /donation/) с групповым коммитом
+через AllocationWorker при разных окнах ожидания пачки.
+Каждый клиент создаёт пожертвования последовательно, клиенты
+работают конкурентно. Запуск из корня проекта:
+
+    python -m benchmarks.group_commit
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, engine_options, set_sqlite_pragmas
+from app.models import CharityProject, Donation
+from app.services.allocation_worker import AllocationWorker
+from app.services.invested import invest_with_retry
+
+
+DONATIONS = 2_000
+CLIENTS = 50
+PROJECTS = 100
+MAX_BATCH_SIZE = 200
+WINDOWS_MS = (0, 1, 5)
+
+
+async def run_clients(create: Callable[[], Awaitable[None]]) -> List[float]:
+    latencies: List[float] = []
+
+    async def client(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await create()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(
+        *(client(DONATIONS // CLIENTS) for _ in range(CLIENTS))
+    )
+    return latencies
+
+
+async def measure(title: str, window_ms: Optional[int] = None) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        engine = create_async_engine(url, **engine_options(url))
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with session_factory() as session:
+            session.add_all(
+                CharityProject(
+                    name=f"project {number}",
+                    description="benchmark",
+                    full_amount=DONATIONS * 10 // PROJECTS,
+                )
+                for number in range(PROJECTS)
+            )
+            await session.commit()
+
+        worker = None
+        if window_ms is None:
+
+            async def create() -> None:
+                async with session_factory() as session:
+
+                    async def prepare() -> Donation:
+                        return Donation(full_amount=10)
+
+                    await invest_with_retry(prepare, session)
+
+        else:
+            worker = AllocationWorker(
+                session_factory, MAX_BATCH_SIZE, DONATIONS, window_ms / 1000
+            )
+            await worker.start()
+
+            async def create() -> None:
+                await worker.submit(Donation, {"full_amount": 10})
+
+        start = time.perf_counter()
+        latencies = await run_clients(create)
+        elapsed = time.perf_counter() - start
+        if worker is not None:
+            await worker.stop()
+        await engine.dispose()
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{title:>16}: {DONATIONS / elapsed:8.1f} donations/s, "
+        f"p50 {percentiles[49] * 1000:7.2f} ms, "
+        f"p99 {percentiles[98] * 1000:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    await measure("per request")
+    for window_ms in WINDOWS_MS:
+        await measure(f"worker {window_ms} ms", window_ms)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
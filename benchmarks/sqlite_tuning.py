@@ -0,0 +1,86 @@
+"""Пропускная способность конкурентной записи пожертвований в SQLite.
+
+Сравнивает движок по умолчанию (NullPool, без PRAGMA) с настроенным
+движком из app.core.db (пул соединений, WAL, synchronous=NORMAL).
+Запуск из корня проекта:
+
+    python -m benchmarks.sqlite_tuning
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base, engine_options, set_sqlite_pragmas
+from app.models import CharityProject, Donation
+from app.services.invested import invest
+
+
+DONATIONS = 1_000
+CONCURRENCY = 20
+PROJECTS = 100
+
+
+async def write_donations(session_factory, count: int) -> int:
+    errors = 0
+    for _ in range(count):
+        async with session_factory() as session:
+            try:
+                await invest(Donation(full_amount=10), session)
+            except OperationalError:
+                errors += 1
+    return errors
+
+
+async def measure(tuned: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        if tuned:
+            engine = create_async_engine(url, **engine_options(url))
+            event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+        else:
+            engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with session_factory() as session:
+            session.add_all(
+                CharityProject(
+                    name=f"project {number}",
+                    description="benchmark",
+                    full_amount=DONATIONS * 10 // PROJECTS,
+                )
+                for number in range(PROJECTS)
+            )
+            await session.commit()
+        start = time.perf_counter()
+        errors = await asyncio.gather(
+            *(
+                write_donations(session_factory, DONATIONS // CONCURRENCY)
+                for _ in range(CONCURRENCY)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    title = "tuned" if tuned else "default"
+    print(
+        f"{title:>8}: {DONATIONS / elapsed:8.1f} donations/s, "
+        f"errors: {sum(errors)}"
+    )
+
+
+async def main() -> None:
+    await measure(tuned=False)
+    await measure(tuned=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
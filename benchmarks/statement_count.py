@@ -0,0 +1,121 @@
+"""Число SQL-запросов на одну операцию записи.
+
+Повторяет путь POST /donation/, POST /charity_project/ и
+PATCH /charity_project/{id} (без проверки авторизации) и считает
+запросы, которые движок отправил в БД. Считаются и запросы без
+открытых объектов, и с очередью открытых объектов в памяти.
+Запуск из корня проекта:
+
+    python -m benchmarks.statement_count
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.validators import (
+    check_charity_project_exists,
+    check_name_duplicate,
+)
+from app.core.config import settings
+from app.core.db import Base, engine_options
+from app.crud.charity_project import charity_project_crud
+from app.models import CharityProject, Donation
+from app.schemas.charity_project import CharityProjectUpdate
+from app.services.fund_stats import rebuild_fund_stats
+from app.services.invested import invest_with_retry
+from app.services.open_queue import rebuild_open_queues
+
+
+async def create_donation(session: AsyncSession) -> None:
+    async def prepare() -> Donation:
+        return Donation(full_amount=10)
+
+    await invest_with_retry(prepare, session)
+
+
+async def create_project(session: AsyncSession) -> None:
+    await check_name_duplicate("benchmark", session)
+
+    async def prepare() -> CharityProject:
+        return CharityProject(
+            name="benchmark", description="benchmark", full_amount=5
+        )
+
+    await invest_with_retry(prepare, session)
+
+
+async def update_project(session: AsyncSession) -> None:
+    async def prepare() -> CharityProject:
+        project = await check_charity_project_exists(1, session)
+        return await charity_project_crud.update(
+            project,
+            CharityProjectUpdate(description="updated"),
+            session,
+            commit=False,
+        )
+
+    await invest_with_retry(prepare, session)
+
+
+async def count_statements(
+    title: str,
+    operation: Callable[[AsyncSession], Awaitable[None]],
+    open_projects: bool,
+) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        engine = create_async_engine(url, **engine_options(url))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with session_factory() as session:
+            if open_projects:
+                session.add(
+                    CharityProject(
+                        name="open", description="open", full_amount=100
+                    )
+                )
+            await rebuild_fund_stats(session)
+            await session.commit()
+            await rebuild_open_queues(session)
+
+        statements: List[str] = []
+
+        def record(conn, cursor, statement, parameters, context, many):
+            statements.append(statement.split(None, 1)[0])
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        async with session_factory() as session:
+            await operation(session)
+        await engine.dispose()
+    print(f"{title:>40}: {len(statements)} ({' '.join(statements)})")
+
+
+async def main() -> None:
+    for open_queue_enabled in (False, True):
+        settings.open_queue_enabled = open_queue_enabled
+        suffix = ", open queue" if open_queue_enabled else ""
+        await count_statements(
+            f"donation, fills nothing{suffix}", create_donation, False
+        )
+        await count_statements(
+            f"donation, fills a project{suffix}", create_donation, True
+        )
+        await count_statements(
+            f"project, nothing to invest{suffix}", create_project, False
+        )
+        await count_statements(
+            f"project update{suffix}", update_project, True
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
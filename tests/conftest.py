@@ -49,6 +49,7 @@ BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 pytest_plugins = [
     "fixtures.user",
     "fixtures.data",
+    "fixtures.jobs",
 ]
 
 TEST_DB = BASE_DIR / "test.db"
@@ -0,0 +1,22 @@
+import time
+
+import pytest
+from conftest import TestingSessionLocal
+
+from app.services.jobs import job_runner
+
+
+@pytest.fixture
+def job_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_runner, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(job_runner, "files_dir", tmp_path)
+    return tmp_path
+
+
+def wait_for_job(client, job_id):
+    for _ in range(200):
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Задача {job_id} не завершилась: {job}")
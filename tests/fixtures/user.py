@@ -63,3 +63,11 @@ def superuser_client():
     app.dependency_overrides[current_superuser] = lambda: superuser
     with TestClient(app) as client:
         yield client
+
+
+@pytest.fixture
+def auth_client():
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    with TestClient(app) as client:
+        yield client
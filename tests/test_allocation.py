@@ -0,0 +1,94 @@
+from collections import namedtuple
+from datetime import datetime
+
+from hypothesis import given, strategies as st
+
+from app.models import Donation
+from app.services.allocation import expand_fill, fill_prefix
+from app.services.invested import close_if_fully_invested, invest_funds
+
+
+Source = namedtuple(
+    "Source", "id full_amount invested_amount create_date version_id"
+)
+
+amounts = st.lists(st.integers(min_value=0, max_value=100), max_size=30)
+sources = st.lists(
+    st.integers(min_value=1, max_value=100).flatmap(
+        lambda full_amount: st.tuples(
+            st.just(full_amount),
+            st.integers(min_value=0, max_value=full_amount),
+        )
+    ),
+    max_size=30,
+).map(
+    lambda rows: [
+        Source(number, full_amount, invested_amount, datetime.now(), 1)
+        for number, (full_amount, invested_amount) in enumerate(rows, 1)
+    ]
+)
+
+
+def sequential_invest(target, sources):
+    """Распределение по одному объекту за шаг, как до префиксных сумм."""
+    updates = []
+    for source in sources:
+        invest_amount = min(
+            target.full_amount - target.invested_amount,
+            source.full_amount - source.invested_amount,
+        )
+        if invest_amount <= 0:
+            continue
+        target.invested_amount += invest_amount
+        close_if_fully_invested(target)
+        invested_amount = source.invested_amount + invest_amount
+        updates.append(
+            (source.id, invested_amount, invested_amount >= source.full_amount)
+        )
+        if target.fully_invested:
+            break
+    return updates
+
+
+@given(st.integers(min_value=-10, max_value=3000), amounts)
+def test_fill_prefix_is_fifo(total, remaining):
+    diff = fill_prefix(total, remaining)
+    increments = expand_fill(diff, remaining)
+
+    assert diff.used == sum(increments) == min(max(total, 0), sum(remaining))
+    assert increments[:diff.filled] == remaining[:diff.filled]
+    assert all(
+        0 <= increment <= amount
+        for increment, amount in zip(increments, remaining)
+    )
+    assert not any(increments[diff.filled + 1:]), (
+        "За границей заполнения средства вкладываться не должны."
+    )
+
+
+@given(
+    st.integers(min_value=1, max_value=2000),
+    st.integers(min_value=0, max_value=2000),
+    sources,
+)
+def test_invest_funds_matches_sequential_loop(full_amount, invested, rows):
+    invested = min(invested, full_amount - 1)
+    target = Donation(
+        full_amount=full_amount, invested_amount=invested, fully_invested=False
+    )
+    expected_target = Donation(
+        full_amount=full_amount, invested_amount=invested, fully_invested=False
+    )
+
+    updates = invest_funds(target, rows)
+    expected = sequential_invest(expected_target, rows)
+
+    assert [
+        (update.id, update.invested_amount, update.close_date is not None)
+        for update in updates
+    ] == expected
+    assert target.invested_amount == expected_target.invested_amount
+    assert target.fully_invested == expected_target.fully_invested
+    assert all(update.fully_invested for update in updates[:-1]), (
+        "Все источники, кроме последнего, должны закрываться полностью."
+    )
@@ -0,0 +1,79 @@
+import pytest
+from conftest import TestingSessionLocal
+from hypothesis import given, strategies as st
+from sqlalchemy import select
+
+from app import cli
+from app.models import CharityProject, Donation
+from app.services import allocation
+
+
+allocation_numpy = pytest.importorskip("app.services.allocation_numpy")
+
+queues = st.lists(st.integers(min_value=0, max_value=100), max_size=40)
+
+
+@given(queues, queues)
+def test_numpy_matches_pure_python(left, right):
+    left_indexes, right_indexes, amounts = allocation_numpy.match_queues(
+        left, right
+    )
+
+    expected = [
+        list(column) for column in zip(*allocation.match_queues(left, right))
+    ]
+
+    assert [
+        left_indexes.tolist(),
+        right_indexes.tolist(),
+        amounts.tolist(),
+    ] == (expected or [[], [], []]), (
+        "Векторное распределение должно совпадать с эталонным на Python."
+    )
+
+
+async def test_rebalance_matches_open_donations_and_projects():
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            [
+                CharityProject(name="a", description="a", full_amount=100),
+                CharityProject(name="b", description="b", full_amount=50),
+                Donation(full_amount=30),
+                Donation(full_amount=90, invested_amount=10),
+            ]
+        )
+        await session.commit()
+
+    async with TestingSessionLocal() as session:
+        plan = await allocation_numpy.plan_rebalance(session)
+        await allocation_numpy.apply_rebalance(plan, session)
+        await session.commit()
+
+    assert plan.allocations == [(1, 1, 30), (2, 1, 70), (2, 2, 10)]
+    async with TestingSessionLocal() as session:
+        projects = (
+            await session.execute(
+                select(
+                    CharityProject.invested_amount,
+                    CharityProject.fully_invested,
+                ).order_by(CharityProject.id)
+            )
+        ).all()
+        donations = (
+            await session.execute(
+                select(Donation.fully_invested).order_by(Donation.id)
+            )
+        ).scalars().all()
+    assert [tuple(project) for project in projects] == [
+        (100, True),
+        (10, False),
+    ]
+    assert donations == [True, True]
+
+
+def test_rebalance_apply_refuses_memory_cache(capsys):
+    assert cli.main(["rebalance", "--apply"]) == 2, (
+        "Перебалансировка не должна менять БД, если кэш приложения "
+        "нельзя сбросить из командной строки."
+    )
+    assert "--offline" in capsys.readouterr().err
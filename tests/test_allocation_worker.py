@@ -0,0 +1,130 @@
+import asyncio
+
+from conftest import engine
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models import CharityProject, Donation
+from app.services.allocation_worker import AllocationWorker
+from app.services.open_queue import open_queues, rebuild_open_queues
+
+
+WorkerSessionLocal = sessionmaker(
+    class_=AsyncSession, bind=engine, expire_on_commit=False
+)
+
+
+async def test_worker_allocates_concurrent_commands():
+    worker = AllocationWorker(WorkerSessionLocal, 16, 64)
+    await worker.start()
+    try:
+        project = await worker.submit(
+            CharityProject,
+            {
+                "name": "project",
+                "description": "description",
+                "full_amount": 100,
+            },
+        )
+        donations = await asyncio.gather(
+            *(worker.submit(Donation, {"full_amount": 10}) for _ in range(15))
+        )
+    finally:
+        await worker.stop()
+
+    assert project.id is not None
+    assert sum(donation.invested_amount for donation in donations) == 100, (
+        "Обработчик должен вложить в проект ровно его полную сумму."
+    )
+    async with WorkerSessionLocal() as session:
+        db_project = await session.get(CharityProject, project.id)
+        donations_invested = await session.scalar(
+            select(func.sum(Donation.invested_amount))
+        )
+    assert db_project.fully_invested
+    assert donations_invested == 100
+
+
+async def test_worker_isolates_failed_command():
+    worker = AllocationWorker(WorkerSessionLocal, 16, 64)
+    await worker.start()
+    try:
+        results = await asyncio.gather(
+            worker.submit(Donation, {"full_amount": 10}),
+            worker.submit(Donation, {"full_amount": -1}),
+            worker.submit(Donation, {"full_amount": 20}),
+            return_exceptions=True,
+        )
+    finally:
+        await worker.stop()
+
+    assert isinstance(results[1], Exception), (
+        "Ошибка записи должна вернуться отправителю команды."
+    )
+    assert [results[0].full_amount, results[2].full_amount] == [10, 20], (
+        "Ошибка одной команды не должна затрагивать остальные."
+    )
+
+
+async def test_worker_batch_waits_for_window():
+    worker = AllocationWorker(WorkerSessionLocal, 3, 64, batch_window=0.5)
+    worker._queue = asyncio.Queue()
+    for number in range(4):
+        asyncio.get_running_loop().call_later(
+            number * 0.01, worker._queue.put_nowait, number
+        )
+
+    assert await worker._next_batch() == [0, 1, 2], (
+        "Пачка должна собирать команды, пришедшие в пределах окна, "
+        "но не больше max_batch_size."
+    )
+    assert await worker._next_batch() == [3]
+
+
+async def test_worker_batch_with_open_queue(monkeypatch):
+    monkeypatch.setattr(settings, "open_queue_enabled", True)
+    async with WorkerSessionLocal() as session:
+        session.add_all(
+            [
+                CharityProject(name="a", description="a", full_amount=10),
+                CharityProject(name="b", description="b", full_amount=10),
+            ]
+        )
+        await session.commit()
+        await rebuild_open_queues(session)
+    worker = AllocationWorker(WorkerSessionLocal, 16, 64, batch_window=0.1)
+    await worker.start()
+    try:
+        results = await asyncio.gather(
+            worker.submit(Donation, {"full_amount": 10}),
+            worker.submit(Donation, {"full_amount": 10}),
+            worker.submit(
+                CharityProject,
+                {"name": "c", "description": "c", "full_amount": 5},
+            ),
+            worker.submit(Donation, {"full_amount": 5}),
+        )
+    finally:
+        await worker.stop()
+        for queue in open_queues.values():
+            queue.clear()
+
+    donations = [results[0], results[1], results[3]]
+    assert [donation.invested_amount for donation in donations] == [
+        10,
+        10,
+        5,
+    ], (
+        "Команды одной пачки должны видеть источники, закрытые и "
+        "созданные предыдущими командами."
+    )
+    async with WorkerSessionLocal() as session:
+        projects = (
+            await session.execute(
+                select(CharityProject.name, CharityProject.invested_amount)
+                .order_by(CharityProject.id)
+            )
+        ).all()
+    assert projects == [("a", 10), ("b", 10), ("c", 5)]
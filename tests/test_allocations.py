@@ -0,0 +1,76 @@
+import pytest
+
+
+PROJECT_ALLOCATIONS_URL = "/charity_project/{project_id}/allocations"
+DONATION_ALLOCATIONS_URL = "/donation/{donation_id}/allocations"
+
+
+def ledger(response):
+    return [
+        (row["donation_id"], row["charity_project_id"], row["amount"])
+        for row in response.json()
+    ]
+
+
+@pytest.mark.usefixtures("charity_project", "charity_project_nunchaku")
+def test_donation_allocations_recorded(user_client):
+    user_client.post("/donation/", json={"full_amount": 1000})
+    donation = user_client.post(
+        "/donation/", json={"full_amount": 1000000}
+    ).json()
+
+    response = user_client.get(
+        DONATION_ALLOCATIONS_URL.format(donation_id=donation["id"])
+    )
+    assert response.status_code == 200
+    assert ledger(response) == [(2, 1, 999000), (2, 2, 1000)], (
+        "Журнал должен содержать все переводы пожертвования в проекты."
+    )
+    assert response.json()[0]["created_at"]
+
+
+@pytest.mark.usefixtures("donation", "another_donation")
+def test_project_allocations_keyset_pagination(superuser_client):
+    project = superuser_client.post(
+        "/charity_project/",
+        json={"name": "new", "description": "new", "full_amount": 5000},
+    ).json()
+    url = PROJECT_ALLOCATIONS_URL.format(project_id=project["id"])
+
+    first_page = superuser_client.get(url, params={"limit": 1})
+    assert ledger(first_page) == [(1, project["id"], 100)]
+    assert 'rel="next"' in first_page.headers["link"]
+    second_page = superuser_client.get(
+        url, params={"limit": 1, "after": first_page.json()[0]["id"]}
+    )
+    assert ledger(second_page) == [(2, project["id"], 2000)]
+
+
+@pytest.mark.usefixtures("charity_project")
+def test_bulk_import_records_allocations(superuser_client):
+    superuser_client.post(
+        "/donation/bulk", json=[{"full_amount": 300}, {"full_amount": 700}]
+    )
+
+    response = superuser_client.get(
+        PROJECT_ALLOCATIONS_URL.format(project_id=1)
+    )
+    assert ledger(response) == [(1, 1, 300), (2, 1, 700)]
+
+
+@pytest.mark.usefixtures("another_donation")
+def test_foreign_donation_allocations_forbidden(user_client):
+    response = user_client.get(DONATION_ALLOCATIONS_URL.format(donation_id=1))
+    assert response.status_code == 403
+
+
+def test_donation_allocations_not_found(user_client):
+    response = user_client.get(DONATION_ALLOCATIONS_URL.format(donation_id=1))
+    assert response.status_code == 404
+
+
+def test_project_allocations_not_found(superuser_client):
+    response = superuser_client.get(
+        PROJECT_ALLOCATIONS_URL.format(project_id=1)
+    )
+    assert response.status_code == 404
@@ -0,0 +1,196 @@
+import json
+import random
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+from app.models import Donation
+from app.services.invested import invest_funds, merge_funds
+
+
+DONATIONS_BULK_URL = "/donation/bulk"
+PROJECTS_BULK_URL = "/charity_project/bulk"
+
+Source = namedtuple(
+    "Source", "id full_amount invested_amount create_date version_id"
+)
+
+
+def test_merge_funds_matches_sequential_invest():
+    randomizer = random.Random(0)
+    for _ in range(200):
+        amounts = [randomizer.randint(1, 50) for _ in range(10)]
+        sources = []
+        for number in range(1, 9):
+            full_amount = randomizer.randint(1, 60)
+            sources.append(
+                Source(
+                    number,
+                    full_amount,
+                    randomizer.randint(0, full_amount - 1),
+                    datetime.now(),
+                    1,
+                )
+            )
+        expected_invested, expected_sources = [], {}
+        for amount in amounts:
+            target = Donation(
+                full_amount=amount, invested_amount=0, fully_invested=False
+            )
+            current = [
+                source._replace(
+                    invested_amount=expected_sources.get(
+                        source.id, source.invested_amount
+                    )
+                )
+                for source in sources
+            ]
+            for update in invest_funds(target, current):
+                expected_sources[update.id] = update.invested_amount
+            expected_invested.append(target.invested_amount)
+
+        invested, updates, _ = merge_funds(amounts, sources)
+
+        assert invested == expected_invested, (
+            "Один проход должен распределять средства так же, "
+            "как последовательные вызовы invest_funds."
+        )
+        assert {
+            update.id: update.invested_amount for update in updates
+        } == expected_sources
+        assert all(
+            update.fully_invested == (update.close_date is not None)
+            for update in updates
+        )
+
+
+@pytest.mark.usefixtures("charity_project")
+@pytest.mark.parametrize(
+    "content_type, body",
+    [
+        (
+            "application/json",
+            json.dumps([{"full_amount": 300}, {"full_amount": 700}]),
+        ),
+        (
+            "application/x-ndjson",
+            '{"full_amount": 300}\n{"full_amount": 700, "comment": "hi"}\n',
+        ),
+        ("text/csv", "full_amount,comment\n300,\n700,hi\n"),
+    ],
+)
+def test_bulk_donations(superuser_client, content_type, body):
+    response = superuser_client.post(
+        DONATIONS_BULK_URL, data=body, headers={"Content-Type": content_type}
+    )
+    assert response.status_code == 200, response.json()
+    assert response.json() == {"created": 2, "invested_amount": 1000}
+
+    donations = superuser_client.get("/donation/").json()
+    assert [donation["full_amount"] for donation in donations] == [300, 700]
+    assert all(donation["fully_invested"] for donation in donations)
+    project = superuser_client.get("/charity_project/").json()[0]
+    assert project["invested_amount"] == 1000
+
+
+@pytest.mark.usefixtures("charity_project")
+def test_bulk_donations_ledger(superuser_client, mixer):
+    mixer.blend(
+        "app.models.donation.Donation",
+        user_id=1,
+        full_amount=50,
+        invested_amount=50,
+        fully_invested=True,
+        create_date=datetime.now(),
+    )
+    response = superuser_client.post(
+        DONATIONS_BULK_URL, json=[{"full_amount": 300}, {"full_amount": 700}]
+    )
+    assert response.status_code == 200, response.json()
+
+    donation_ids = {
+        donation["full_amount"]: donation["id"]
+        for donation in superuser_client.get("/donation/").json()
+    }
+    allocations = superuser_client.get(
+        "/charity_project/1/allocations"
+    ).json()
+    assert {
+        (allocation["donation_id"], allocation["amount"])
+        for allocation in allocations
+    } == {(donation_ids[300], 300), (donation_ids[700], 700)}, (
+        "Переводы массовой загрузки должны ссылаться на созданные ею "
+        "пожертвования, даже если у пользователя есть другие с той же "
+        "датой создания."
+    )
+
+
+def test_bulk_donations_invalid_rows(superuser_client):
+    response = superuser_client.post(
+        DONATIONS_BULK_URL,
+        json=[{"full_amount": 10}, {"full_amount": -1}, {}],
+    )
+    assert response.status_code == 422
+    assert [error["row"] for error in response.json()["detail"]] == [2, 3], (
+        "Ответ должен указывать номера невалидных строк."
+    )
+    assert superuser_client.get("/donation/").json() == [], (
+        "При ошибке валидации не должно создаваться ни одного пожертвования."
+    )
+
+
+def test_bulk_donations_malformed_body(superuser_client):
+    response = superuser_client.post(
+        DONATIONS_BULK_URL,
+        data="{not json",
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+
+
+def test_bulk_donations_forbidden_for_user(user_client):
+    response = user_client.post(DONATIONS_BULK_URL, json=[{"full_amount": 1}])
+    assert response.status_code in (401, 403)
+
+
+@pytest.mark.usefixtures("donation", "another_donation")
+def test_bulk_projects_take_open_donations_in_order(superuser_client):
+    response = superuser_client.post(
+        PROJECTS_BULK_URL,
+        json=[
+            {"name": "first", "description": "first", "full_amount": 1000},
+            {"name": "second", "description": "second", "full_amount": 5000},
+        ],
+    )
+    assert response.status_code == 200, response.json()
+    projects = response.json()
+    assert [project["name"] for project in projects] == ["first", "second"]
+    assert [project["invested_amount"] for project in projects] == [
+        1000,
+        1100,
+    ], "Открытые пожертвования должны распределяться в порядке создания."
+    assert projects[0]["fully_invested"]
+    assert not projects[1]["fully_invested"]
+    assert all(
+        donation["fully_invested"]
+        for donation in superuser_client.get("/donation/").json()
+    )
+
+
+@pytest.mark.usefixtures("charity_project")
+@pytest.mark.parametrize(
+    "names", [["chimichangas4life", "new"], ["twice", "twice"]]
+)
+def test_bulk_projects_duplicate_names(superuser_client, names):
+    response = superuser_client.post(
+        PROJECTS_BULK_URL,
+        json=[
+            {"name": name, "description": "description", "full_amount": 10}
+            for name in names
+        ],
+    )
+    assert response.status_code == 400
+    assert len(superuser_client.get("/charity_project/").json()) == 1, (
+        "При повторяющемся названии не должно создаваться ни одного проекта."
+    )
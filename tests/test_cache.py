@@ -0,0 +1,217 @@
+import asyncio
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    CacheNamespace,
+    MemoryCache,
+    read_reply,
+    RedisCache,
+    set_cache,
+)
+
+
+class FakeRedisServer:
+    """Минимальный сервер с протоколом Redis для тестов."""
+
+    def __init__(self):
+        self.data = {}
+        self.server = None
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                command, *args = await read_reply(reader)
+                writer.write(self.execute(command.upper(), args))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    def execute(self, command, args):
+        if command == b"GET":
+            value = self.data.get(args[0])
+            if value is None:
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            self.data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % int(self.data.pop(args[0], None) is not None)
+        if command == b"INCR":
+            value = int(self.data.get(args[0], 0)) + 1
+            self.data[args[0]] = str(value).encode()
+            return b":%d\r\n" % value
+        return b"-ERR unknown command\r\n"
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+
+@pytest.fixture
+def memory_cache():
+    cache = MemoryCache(max_size=2)
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+async def test_memory_cache_lru_eviction(memory_cache):
+    await memory_cache.set("a", b"1")
+    await memory_cache.set("b", b"2")
+    assert await memory_cache.get("a") == b"1"
+    await memory_cache.set("c", b"3")
+    assert await memory_cache.get("b") is None, (
+        "При превышении размера кэш должен вытеснять "
+        "давно не использованный ключ."
+    )
+    assert await memory_cache.get("a") == b"1"
+    assert (memory_cache.hits, memory_cache.misses) == (2, 1)
+
+
+async def test_memory_cache_ttl(memory_cache, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+    await memory_cache.set("a", b"1", ttl=10)
+    assert await memory_cache.get("a") == b"1"
+    now += 10
+    assert await memory_cache.get("a") is None, (
+        "Значение должно пропадать из кэша по истечении TTL."
+    )
+
+
+async def test_namespace_invalidation(memory_cache):
+    namespace = CacheNamespace("projects")
+    await namespace.set("page", b"data")
+    assert await namespace.get("page") == b"data"
+    await namespace.invalidate()
+    assert await namespace.get("page") is None
+
+
+async def test_namespace_version_survives_eviction():
+    cache = MemoryCache(max_size=2)
+    set_cache(cache)
+    try:
+        namespace = CacheNamespace("projects")
+        await namespace.set("page", b"old")
+        await namespace.invalidate()
+        await namespace.set("page", b"new")
+        for number in range(3):
+            await cache.set(f"other:{number}", b"data")
+        await cache.set("projects:0:page", b"old")
+        assert await namespace.get("page") != b"old", (
+            "Вытеснение по LRU не должно сбрасывать версию "
+            "пространства ключей."
+        )
+    finally:
+        set_cache(None)
+
+
+async def test_namespace_set_keeps_captured_version(memory_cache):
+    namespace = CacheNamespace("projects")
+    version = await namespace.version()
+    assert await namespace.get("page", version) is None
+    await namespace.invalidate()
+    await namespace.set("page", b"stale", version)
+    assert await namespace.get("page") is None, (
+        "Значение, собранное до инвалидации, не должно попадать "
+        "в новую версию пространства ключей."
+    )
+
+
+async def test_namespace_group_invalidation(memory_cache):
+    namespace = CacheNamespace("user")
+    marker = await namespace.marker("1")
+    await namespace.set("1:token", b"data", marker)
+    assert await namespace.marker("1") == marker
+    assert await namespace.get("1:token", marker) == b"data"
+    await namespace.invalidate_group("1")
+    marker = await namespace.marker("1")
+    assert await namespace.get("1:token", marker) is None
+    assert not memory_cache._counters, (
+        "Сброс группы ключей не должен заводить счётчик на группу."
+    )
+
+
+async def test_namespace_group_marker_eviction_is_a_miss():
+    cache = MemoryCache(max_size=3)
+    set_cache(cache)
+    try:
+        namespace = CacheNamespace("user")
+        marker = await namespace.marker("1")
+        await namespace.set("1:token", b"stale", marker)
+        await cache.set("other", b"data")
+        await cache.set("another", b"data")
+        assert await namespace.get("1:token", marker) == b"stale"
+        assert await namespace.get(
+            "1:token", await namespace.marker("1")
+        ) is None, (
+            "Вытесненная метка группы должна означать промах, "
+            "а не возврат старых значений."
+        )
+    finally:
+        set_cache(None)
+
+
+async def test_redis_cache_against_fake_server():
+    async with FakeRedisServer() as server:
+        cache = RedisCache(server.url)
+        assert await cache.get("a") is None
+        await cache.set("a", b"value\r\nwith crlf", ttl=60)
+        assert await cache.get("a") == b"value\r\nwith crlf"
+        assert await cache.incr("counter") == 1
+        assert await cache.incr("counter") == 2
+        await cache.delete("a")
+        assert await cache.get("a") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        await cache.close()
+
+
+async def test_unavailable_cache_is_a_miss():
+    async with FakeRedisServer() as server:
+        url = server.url
+    set_cache(RedisCache(url))
+    try:
+        namespace = CacheNamespace("projects")
+        await namespace.set("page", b"data")
+        assert await namespace.get("page") is None, (
+            "Недоступный сервер кэша должен считаться промахом, "
+            "а не ошибкой запроса."
+        )
+    finally:
+        set_cache(None)
+
+
+async def test_hung_cache_is_a_miss():
+    async def hang(reader, writer):
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(hang, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    backend = RedisCache(f"redis://{host}:{port}/0", timeout=0.05)
+    set_cache(backend)
+    try:
+        namespace = CacheNamespace("projects")
+        assert await asyncio.wait_for(namespace.get("page"), 1) is None, (
+            "Зависший сервер кэша должен давать промах по истечении "
+            "таймаута."
+        )
+        assert backend._writer is None, (
+            "После таймаута соединение с сервером кэша должно закрываться."
+        )
+    finally:
+        set_cache(None)
+        server.close()
+        await server.wait_closed()
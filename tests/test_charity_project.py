@@ -2,6 +2,12 @@ import time
 from datetime import datetime
 
 import pytest
+from conftest import app, engine, get_async_session
+from fixtures.user import superuser
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.user import current_user
 
 
 PROJECTS_URL = "/charity_project/"
@@ -746,3 +752,47 @@ def test_get_all_charity_project_not_auth_user(test_client):
         f"пользователя к эндпоинту `{PROJECTS_URL}` возвращается список "
         "существующих проектов."
     )
+
+
+@pytest.fixture
+def non_expiring_client(superuser_client):
+    """Клиент с сессиями, которые, как в приложении, не сбрасывают
+    объекты при коммите."""
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_user] = lambda: superuser
+    return superuser_client
+
+
+def test_created_objects_match_stored(non_expiring_client):
+    donation = non_expiring_client.post(
+        "/donation/", json={"full_amount": 150}
+    ).json()
+    project = non_expiring_client.post(
+        PROJECTS_URL,
+        json={"name": "single", "description": "d", "full_amount": 100},
+    ).json()
+    bulk = non_expiring_client.post(
+        PROJECTS_URL + "bulk",
+        json=[{"name": "bulk", "description": "d", "full_amount": 50}],
+    ).json()
+    assert project["close_date"] is not None
+    assert bulk[0]["close_date"] is not None
+    assert non_expiring_client.get(PROJECTS_URL).json() == [
+        project,
+        *bulk,
+    ], (
+        "Созданные проекты должны возвращаться в том же виде, что и при "
+        "чтении из БД."
+    )
+    assert non_expiring_client.get("/donation/my").json() == [donation], (
+        "Созданное пожертвование должно возвращаться в том же виде, что и "
+        "при чтении из БД."
+    )
@@ -0,0 +1,90 @@
+import asyncio
+
+from conftest import TestingSessionLocal
+from sqlalchemy import func, select
+
+from app.models import CharityProject, Donation
+from app.services.invested import (
+    AllocationConflict,
+    apply_source_updates,
+    invest_with_retry,
+    SourceUpdate,
+)
+
+
+DONATIONS = 200
+
+
+async def donate(amount):
+    async with TestingSessionLocal() as session:
+
+        async def prepare():
+            donation = Donation(full_amount=amount)
+            session.add(donation)
+            return donation
+
+        await invest_with_retry(prepare, session)
+
+
+async def test_concurrent_donations_conserve_money():
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            CharityProject(
+                name=f"project {number}",
+                description="description",
+                full_amount=150,
+            )
+            for number in range(10)
+        )
+        await session.commit()
+
+    results = await asyncio.gather(
+        *(donate(10) for _ in range(DONATIONS)), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert not errors, (
+        "Конкурентные пожертвования должны сохраняться без ошибок, "
+        f"получено: {errors[:3]}"
+    )
+
+    async with TestingSessionLocal() as session:
+        projects_invested = await session.scalar(
+            select(func.sum(CharityProject.invested_amount))
+        )
+        donations_invested = await session.scalar(
+            select(func.sum(Donation.invested_amount))
+        )
+        overfilled = await session.scalar(
+            select(func.count()).where(
+                CharityProject.invested_amount > CharityProject.full_amount
+            )
+        )
+    assert projects_invested == donations_invested == 1500, (
+        "При конкурентных пожертвованиях сумма, вложенная в проекты, "
+        "должна совпадать с суммой, списанной с пожертвований."
+    )
+    assert overfilled == 0
+
+
+async def test_stale_source_update_raises_conflict():
+    async with TestingSessionLocal() as session:
+        session.add(
+            CharityProject(name="project", description="d", full_amount=100)
+        )
+        await session.commit()
+    stale_update = SourceUpdate(1, 100, 10, None, None, version_id=1)
+    async with TestingSessionLocal() as session:
+        await apply_source_updates(CharityProject, [stale_update], session)
+        await session.commit()
+    async with TestingSessionLocal() as session:
+        try:
+            await apply_source_updates(
+                CharityProject, [stale_update], session
+            )
+        except AllocationConflict:
+            pass
+        else:
+            raise AssertionError(
+                "Обновление строки с устаревшим version_id должно "
+                "вызывать AllocationConflict."
+            )
@@ -0,0 +1,30 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.db import engine_options, set_sqlite_pragmas, TimedQueuePool
+
+
+def test_engine_options_for_sqlite():
+    file_options = engine_options("sqlite+aiosqlite:///./fastapi.db")
+    assert file_options["poolclass"] is TimedQueuePool, (
+        "Для файловой SQLite соединения должны переиспользоваться пулом."
+    )
+    assert issubclass(TimedQueuePool, AsyncAdaptedQueuePool)
+    assert not file_options["echo"], "Логирование SQL должно быть выключено."
+    memory_options = engine_options("sqlite+aiosqlite://")
+    assert "pool_size" not in memory_options
+
+
+async def test_sqlite_pragmas(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}"
+    engine = create_async_engine(url, **engine_options(url))
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    async with engine.connect() as conn:
+        journal_mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+        synchronous = await conn.exec_driver_sql("PRAGMA synchronous")
+        assert journal_mode.scalar() == "wal"
+        assert synchronous.scalar() == 1, (
+            "Для SQLite должен устанавливаться режим synchronous=NORMAL."
+        )
+    await engine.dispose()
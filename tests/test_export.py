@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+DONATIONS_EXPORT_URL = "/donation/export"
+PROJECTS_EXPORT_URL = "/charity_project/export"
+
+
+@pytest.mark.usefixtures("donation", "another_donation")
+def test_export_donations_ndjson(superuser_client):
+    response = superuser_client.get(DONATIONS_EXPORT_URL)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "application/x-ndjson"
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["full_amount"] for row in rows] == [100, 2000], (
+        f"Выгрузка `{DONATIONS_EXPORT_URL}` должна содержать все "
+        "пожертвования по возрастанию id."
+    )
+    assert rows[0]["comment"] == "To you for chimichangas"
+
+
+@pytest.mark.usefixtures("charity_project", "charity_project_nunchaku")
+def test_export_projects_csv(superuser_client):
+    response = superuser_client.get(
+        PROJECTS_EXPORT_URL, params={"format": "csv"}
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["chimichangas4life", "nunchaku"]
+    assert rows[1]["full_amount"] == "5000000"
+
+
+@pytest.mark.parametrize("url", [DONATIONS_EXPORT_URL, PROJECTS_EXPORT_URL])
+def test_export_forbidden_for_user(user_client, url):
+    response = user_client.get(url)
+    assert response.status_code == 403, (
+        f"Выгрузка `{url}` должна быть доступна только суперпользователям."
+    )
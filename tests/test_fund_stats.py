@@ -0,0 +1,66 @@
+import pytest
+from conftest import TestingSessionLocal
+
+from app.services.fund_stats import (
+    compute_fund_stats,
+    find_stats_drift,
+    rebuild_fund_stats,
+)
+
+
+async def stats_drift():
+    async with TestingSessionLocal() as session:
+        return await find_stats_drift(session)
+
+
+async def test_stats_follow_api_operations(superuser_client):
+    projects = [
+        superuser_client.post(
+            "/charity_project/",
+            json={"name": name, "description": name, "full_amount": amount},
+        ).json()
+        for name, amount in (("first", 100), ("second", 500), ("third", 50))
+    ]
+    superuser_client.post(
+        "/donation/bulk", json=[{"full_amount": 120}, {"full_amount": 30}]
+    )
+    superuser_client.post(
+        "/charity_project/bulk",
+        json=[{"name": "bulk", "description": "bulk", "full_amount": 10}],
+    )
+    superuser_client.delete(f"/charity_project/{projects[2]['id']}")
+
+    assert await stats_drift() == {}, (
+        "Сводные показатели должны обновляться вместе с операциями API."
+    )
+    response = superuser_client.get("/stats/")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total_raised"] == 150
+    assert stats["total_invested"] == 150
+    assert stats["projects_count"] == 3
+    assert stats["closed_projects"] == 1
+    assert stats["open_projects"] == 2
+    assert stats["average_fill_seconds"] == pytest.approx(
+        stats["fill_seconds"]
+    )
+
+
+def test_stats_empty(user_client):
+    response = user_client.get("/stats/")
+    assert response.status_code == 200
+    assert response.json()["donations_count"] == 0
+    assert response.json()["average_fill_seconds"] is None
+
+
+@pytest.mark.usefixtures("charity_project", "donation")
+async def test_rebuild_fixes_drift():
+    drift = await stats_drift()
+    assert drift["projects_count"] == (0, 1)
+    assert drift["total_raised"] == (0, 100)
+
+    async with TestingSessionLocal() as session:
+        values = await rebuild_fund_stats(session)
+        await session.commit()
+        assert values == await compute_fund_stats(session)
+    assert await stats_drift() == {}
@@ -0,0 +1,86 @@
+import pytest
+from conftest import engine
+from sqlalchemy import select
+
+from app import constants
+from app.models import Allocation, CharityProject, Donation
+from app.services.invested import open_sources_query
+from app.services.reports import fastest_projects_query
+
+
+async def explain(query):
+    compiled = query.compile(
+        engine.sync_engine, compile_kwargs={"literal_binds": True}
+    )
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}"
+        )
+        return " ".join(row[-1] for row in result.all())
+
+
+@pytest.mark.parametrize(
+    "model, index_name",
+    [
+        (CharityProject, "ix_charityproject_open_create_date"),
+        (Donation, "ix_donation_open_create_date"),
+    ],
+)
+async def test_open_rows_query_uses_partial_index(model, index_name):
+    plan = await explain(
+        open_sources_query(model).limit(constants.OPEN_PREFIX_BATCH_SIZE)
+    )
+    assert index_name in plan, (
+        "Запрос открытых объектов должен использовать индекс "
+        f"`{index_name}`, план запроса: {plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Запрос открытых объектов не должен сортировать строки отдельно, "
+        f"план запроса: {plan}"
+    )
+
+
+async def test_user_donations_query_uses_index():
+    plan = await explain(select(Donation).where(Donation.user_id == 1))
+    assert "ix_donation_user_id" in plan, (
+        "Запрос пожертвований пользователя должен использовать индекс "
+        f"`ix_donation_user_id`, план запроса: {plan}"
+    )
+
+
+@pytest.mark.parametrize(
+    "column, index_name",
+    [
+        (Allocation.donation_id, "ix_allocation_donation_id"),
+        (Allocation.charity_project_id, "ix_allocation_charity_project_id"),
+    ],
+)
+async def test_allocation_page_query_uses_index(column, index_name):
+    plan = await explain(
+        select(Allocation)
+        .where(column == 1, Allocation.id > 10)
+        .order_by(Allocation.id)
+        .limit(constants.PAGE_SIZE)
+    )
+    assert index_name in plan, (
+        f"Страница журнала распределений должна читаться по индексу "
+        f"`{index_name}`, план запроса: {plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Страница журнала не должна сортироваться отдельно, "
+        f"план запроса: {plan}"
+    )
+
+
+async def test_fastest_projects_query_uses_index():
+    plan = await explain(
+        fastest_projects_query().limit(constants.PAGE_SIZE)
+    )
+    assert "ix_charityproject_closed_fill_seconds" in plan, (
+        "Отчёт о быстрых проектах должен читать индекс "
+        f"`ix_charityproject_closed_fill_seconds`, план запроса: {plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Отчёт о быстрых проектах не должен сортировать строки отдельно, "
+        f"план запроса: {plan}"
+    )
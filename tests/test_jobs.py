@@ -0,0 +1,200 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from conftest import engine, TestingSessionLocal
+from fixtures.jobs import wait_for_job
+from sqlalchemy import event
+
+from app.models import Job
+from app.services import jobs
+from app.services.jobs import JobKind, JobRunner, JobStatus
+
+
+JOBS_URL = "/jobs/"
+
+
+@pytest.fixture
+def unbalanced_project(mixer):
+    return mixer.blend(
+        "app.models.charity_project.CharityProject",
+        name="project",
+        description="description",
+        full_amount=100,
+        invested_amount=40,
+    )
+
+
+@pytest.mark.usefixtures("unbalanced_project")
+def test_fund_stats_rebuild_job(superuser_client, job_files):
+    response = superuser_client.post(
+        JOBS_URL, json={"kind": "fund_stats_rebuild"}
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+
+    job = wait_for_job(superuser_client, response.json()["id"])
+    assert job["status"] == "done", job
+    assert json.loads(job["result"])["projects_count"] == 1
+    assert superuser_client.get("/stats/").json()["open_projects"] == 1
+
+
+@pytest.mark.usefixtures("unbalanced_project")
+def test_allocation_reconcile_job(superuser_client, job_files):
+    response = superuser_client.post(
+        JOBS_URL, json={"kind": "allocation_reconcile"}
+    )
+    job = wait_for_job(superuser_client, response.json()["id"])
+    assert job["progress"] == 100
+    assert json.loads(job["result"]) == {
+        "donation": [],
+        "charityproject": [1],
+    }, "Сверка должна найти проект, вложения которого нет в журнале."
+
+
+async def add_running_job(heartbeat_at):
+    async with TestingSessionLocal() as session:
+        job = Job(
+            kind=JobKind.fund_stats_rebuild,
+            status=JobStatus.running,
+            heartbeat_at=heartbeat_at,
+        )
+        session.add(job)
+        await session.flush()
+        job_id = job.id
+        await session.commit()
+        return job_id
+
+
+async def test_runner_start_fails_stale_jobs(tmp_path):
+    now = datetime.now(timezone.utc)
+    job_ids = [
+        await add_running_job(None),
+        await add_running_job(now - timedelta(minutes=5)),
+        await add_running_job(now),
+    ]
+    runner = JobRunner(TestingSessionLocal, 1, str(tmp_path))
+    await runner.start()
+    await runner.stop()
+    async with TestingSessionLocal() as session:
+        statuses = [
+            (await session.get(Job, job_id)).status for job_id in job_ids
+        ]
+    assert statuses == [JobStatus.failed, JobStatus.failed, JobStatus.running], (
+        "При старте прерванными должны считаться только активные задачи "
+        "без свежей отметки обработчика."
+    )
+
+
+async def test_fail_orphans_without_stale_jobs_does_not_write(tmp_path):
+    await add_running_job(datetime.now(timezone.utc))
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    runner = JobRunner(TestingSessionLocal, 1, str(tmp_path))
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert await runner.fail_orphans() == 0
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert statements == ["SELECT"], (
+        "Без прерванных задач проверка не должна брать блокировку "
+        f"записи, запросы: {statements}"
+    )
+
+
+def test_get_job_is_read_only(superuser_client, job_files):
+    job_id = asyncio.run(add_running_job(datetime.now(timezone.utc)))
+    job = superuser_client.get(f"{JOBS_URL}{job_id}").json()
+    assert job["status"] == "running", (
+        "Чтение задачи, которую выполняет другой процесс, не должно "
+        "менять её состояние."
+    )
+
+
+async def test_heartbeat_keeps_job_alive(monkeypatch, tmp_path):
+    async def handler(job):
+        await asyncio.sleep(0.2)
+        return None
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, JobKind.fund_stats_rebuild, handler)
+    runner = JobRunner(
+        TestingSessionLocal,
+        1,
+        str(tmp_path),
+        heartbeat_interval=0.02,
+        stale_after=0.1,
+    )
+    other = JobRunner(TestingSessionLocal, 1, str(tmp_path), stale_after=0.1)
+    await runner.start()
+    try:
+        async with TestingSessionLocal() as session:
+            await runner.submit(JobKind.fund_stats_rebuild, session)
+        await asyncio.sleep(0.15)
+        failed = await other.fail_orphans()
+    finally:
+        await runner.stop()
+    assert failed == 0, (
+        "Задача с регулярной отметкой обработчика не должна считаться "
+        "прерванной в другом процессе."
+    )
+
+
+def test_job_without_file(superuser_client, job_files):
+    response = superuser_client.post(
+        JOBS_URL, json={"kind": "fund_stats_rebuild"}
+    )
+    wait_for_job(superuser_client, response.json()["id"])
+    response = superuser_client.get(f"{JOBS_URL}{response.json()['id']}/file")
+    assert response.status_code == 404
+
+
+def test_job_not_found(superuser_client):
+    response = superuser_client.get(f"{JOBS_URL}1")
+    assert response.status_code == 404
+
+
+def test_jobs_forbidden_for_user(user_client):
+    response = user_client.post(JOBS_URL, json={"kind": "fund_stats_rebuild"})
+    assert response.status_code == 403
+
+
+async def test_runner_bounds_concurrency(monkeypatch, tmp_path):
+    running, peak = 0, 0
+
+    async def handler(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return None
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, JobKind.fund_stats_rebuild, handler)
+    runner = JobRunner(TestingSessionLocal, 2, str(tmp_path))
+    await runner.start()
+    try:
+        async with TestingSessionLocal() as session:
+            submitted = [
+                (await runner.submit(JobKind.fund_stats_rebuild, session)).id
+                for _ in range(5)
+            ]
+        for _ in range(200):
+            async with TestingSessionLocal() as session:
+                statuses = [
+                    (await runner.get(job_id, session)).status
+                    for job_id in submitted
+                ]
+            if all(status == JobStatus.done for status in statuses):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await runner.stop()
+
+    assert statuses == [JobStatus.done] * 5
+    assert peak == 2, (
+        "Одновременно должно выполняться не больше concurrency задач."
+    )
@@ -0,0 +1,96 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core import user as user_module
+from app.core.config import settings
+from app.core.user import claims_superuser, jwt_strategy
+from app.models.user import User
+from app.services.token_revocation import TokenRevocationList
+
+
+USER = {"email": "dead@pool.com", "password": "chimichangas4life"}
+
+
+@pytest.fixture(autouse=True)
+def jwt_claims(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_claims_enabled", True)
+    monkeypatch.setattr(
+        user_module, "revoked_tokens", TokenRevocationList(3600)
+    )
+
+
+def login(client, password: str = USER["password"]) -> dict:
+    response = client.post(
+        "/auth/jwt/login",
+        data={"username": USER["email"], "password": password},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def test_superuser_from_claims():
+    token = await jwt_strategy.write_token(
+        User(id=42, is_active=True, is_superuser=True)
+    )
+    user = await claims_superuser(token)
+    assert (user.id, user.is_superuser) == (42, True), (
+        "Права суперпользователя должны браться из утверждений токена."
+    )
+
+
+@pytest.mark.parametrize(
+    "is_active, is_superuser, status_code",
+    [(True, False, 403), (False, True, 401)],
+)
+async def test_claims_without_superuser_rejected(
+    is_active, is_superuser, status_code
+):
+    token = await jwt_strategy.write_token(
+        User(id=42, is_active=is_active, is_superuser=is_superuser)
+    )
+    with pytest.raises(HTTPException) as error:
+        await claims_superuser(token)
+    assert error.value.status_code == status_code
+
+
+async def test_token_without_claims_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_claims_enabled", False)
+    token = await jwt_strategy.write_token(
+        User(id=42, is_active=True, is_superuser=True)
+    )
+    monkeypatch.setattr(settings, "jwt_claims_enabled", True)
+    with pytest.raises(HTTPException) as error:
+        await claims_superuser(token)
+    assert error.value.status_code == 401
+
+
+async def test_destroyed_token_revoked():
+    superuser = User(id=42, is_active=True, is_superuser=True)
+    token = await jwt_strategy.write_token(superuser)
+    await jwt_strategy.destroy_token(token, superuser)
+    with pytest.raises(HTTPException) as error:
+        await claims_superuser(token)
+    assert error.value.status_code == 401, (
+        "Отозванный токен не должен проходить проверку."
+    )
+
+
+def test_logout_revokes_token(auth_client):
+    auth_client.post("/auth/register", json=USER)
+    headers = login(auth_client)
+    assert auth_client.get("/users/me", headers=headers).status_code == 200
+    auth_client.post("/auth/jwt/logout", headers=headers)
+    assert auth_client.get("/users/me", headers=headers).status_code == 401
+
+
+def test_password_change_revokes_old_tokens(auth_client):
+    auth_client.post("/auth/register", json=USER)
+    headers = login(auth_client)
+    response = auth_client.patch(
+        "/users/me", headers=headers, json={"password": "nunchaku4life"}
+    )
+    assert response.status_code == 200
+    assert auth_client.get("/users/me", headers=headers).status_code == 401, (
+        "После смены пароля старые токены должны отзываться."
+    )
+    headers = login(auth_client, "nunchaku4life")
+    assert auth_client.get("/users/me", headers=headers).status_code == 200
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from app.core.metrics import Histogram, HISTOGRAMS
+
+
+METRICS_URL = "/metrics"
+
+
+def metric_value(text, line_start):
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"В выводе нет метрики `{line_start}`:\n{text}")
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("sample", "Пример.", ("route",), (1, 5))
+    for value in (0.5, 3, 3, 7):
+        histogram.observe(("/a\"b",), value)
+
+    assert list(histogram.render())[2:] == [
+        'sample_bucket{route="/a\\"b",le="1"} 1',
+        'sample_bucket{route="/a\\"b",le="5"} 3',
+        'sample_bucket{route="/a\\"b",le="+Inf"} 4',
+        'sample_sum{route="/a\\"b"} 13.5',
+        'sample_count{route="/a\\"b"} 4',
+    ]
+
+
+@pytest.mark.usefixtures("charity_project")
+def test_metrics_endpoint(user_client):
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+    user_client.post("/donation/", json={"full_amount": 300})
+    user_client.get("/charity_project/")
+
+    response = user_client.get(METRICS_URL)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "text/plain; version=0.0.4"
+    )
+    text = response.text
+    assert metric_value(
+        text,
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/charity_project/"}',
+    ) == 1
+    assert metric_value(
+        text, 'allocation_amount_sum{target="donation"}'
+    ) == 300, "Метрики должны учитывать распределённую сумму."
+    assert metric_value(
+        text, 'allocation_rows_updated_count{target="donation"}'
+    ) == 1
+    assert re.search(r"^cache_hits_total\{backend=\"memory\"\} ", text, re.M)
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from conftest import TestingSessionLocal
+
+from app.models import CharityProject
+from app.services.invested import get_open_prefix
+
+
+async def create_projects(count, full_amount=1):
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            CharityProject(
+                name=f"project {number}",
+                description="description",
+                full_amount=full_amount,
+                create_date=datetime(2010, 10, 10) + timedelta(days=number),
+            )
+            for number in range(count)
+        )
+        await session.commit()
+
+
+async def test_open_prefix_loads_only_needed_rows():
+    await create_projects(50, full_amount=100)
+    async with TestingSessionLocal() as session:
+        projects = await get_open_prefix(CharityProject, 150, session)
+        assert [project.id for project in projects] == [1, 2], (
+            "Для покрытия суммы должны загружаться только первые "
+            "открытые проекты."
+        )
+
+
+async def test_open_prefix_reads_several_batches():
+    await create_projects(100)
+    async with TestingSessionLocal() as session:
+        projects = await get_open_prefix(CharityProject, 60, session)
+        assert [project.id for project in projects] == list(range(1, 61))
+        projects = await get_open_prefix(CharityProject, 1000, session)
+        assert len(projects) == 100
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.models import CharityProject, Donation
+from app.services.open_queue import open_queues, OpenEntry, OpenQueue
+
+
+DONATION_URL = "/donation/"
+PROJECTS_URL = "/charity_project/"
+
+
+@pytest.fixture(autouse=True)
+def clear_open_queues():
+    yield
+    for queue in open_queues.values():
+        queue.clear()
+
+
+def make_entry(obj_id, full_amount, invested_amount=0):
+    return OpenEntry(
+        obj_id, full_amount - invested_amount, datetime(2010, 10, 10)
+    )
+
+
+def test_open_queue_take_returns_covering_prefix():
+    queue = OpenQueue(CharityProject)
+    queue.sync(
+        [make_entry(1, 100), make_entry(2, 50), make_entry(3, 10)]
+    )
+    assert queue.take(100) == [1], (
+        "Очередь должна возвращать только объекты, нужные для покрытия суммы."
+    )
+    assert queue.take(120) == [1, 2], (
+        "Очередь должна возвращать минимальный префикс открытых объектов."
+    )
+    assert queue.take(1000) == [1, 2, 3]
+
+
+def test_open_queue_sync_drops_closed_objects():
+    queue = OpenQueue(CharityProject)
+    queue.sync([make_entry(1, 100), make_entry(2, 50)])
+    queue.sync([make_entry(1, 100, 100), make_entry(2, 50, 20)])
+    assert queue.take(1000) == [2]
+    assert queue.take(30) == [2]
+    queue.discard(2)
+    assert len(queue) == 0
+
+
+def test_donation_with_open_queue(
+    monkeypatch, user_client, charity_project, charity_project_nunchaku
+):
+    monkeypatch.setattr(settings, "open_queue_enabled", True)
+    open_queues[CharityProject].sync(
+        [
+            OpenEntry.from_obj(charity_project),
+            OpenEntry.from_obj(charity_project_nunchaku),
+        ]
+    )
+    user_client.post(DONATION_URL, json={"full_amount": 1000000})
+    projects = user_client.get(PROJECTS_URL).json()
+    assert projects[0]["fully_invested"], (
+        "При включённой очереди пожертвование должно закрывать "
+        "первый открытый проект."
+    )
+    assert open_queues[CharityProject].take(1) == [2], (
+        "Закрытый проект должен удаляться из очереди открытых."
+    )
+
+
+def test_stale_open_queue_falls_back_to_db(
+    monkeypatch, user_client, small_fully_charity_project, charity_project
+):
+    monkeypatch.setattr(settings, "open_queue_enabled", True)
+    open_queues[CharityProject].sync(
+        [make_entry(small_fully_charity_project.id, 100)]
+    )
+    user_client.post(DONATION_URL, json={"full_amount": 100})
+    projects = user_client.get(PROJECTS_URL).json()
+    assert [project["invested_amount"] for project in projects] == [0, 100], (
+        "Закрытый проект из устаревшей очереди не должен получать "
+        "средства, а недостающие источники должны читаться из БД."
+    )
+
+
+def test_bulk_donations_update_open_queue(monkeypatch, superuser_client):
+    monkeypatch.setattr(settings, "open_queue_enabled", True)
+
+    async def rebuild(session):
+        raise AssertionError("Очередь не должна перестраиваться из БД.")
+
+    monkeypatch.setattr(open_queues[Donation], "rebuild", rebuild)
+    response = superuser_client.post(
+        "/donation/bulk", json=[{"full_amount": 30}, {"full_amount": 70}]
+    )
+    assert response.status_code == 200, response.json()
+    assert open_queues[Donation].take(100) == [1, 2], (
+        "Массовая загрузка должна добавлять пожертвования в очередь "
+        "открытых объектов."
+    )
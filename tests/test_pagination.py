@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+
+PROJECTS_URL = "/charity_project/"
+DONATIONS_URL = "/donation/"
+
+
+@pytest.fixture
+def five_projects(mixer):
+    return [
+        mixer.blend(
+            "app.models.charity_project.CharityProject",
+            name=f"project {number}",
+            description="description",
+            full_amount=100,
+            fully_invested=number % 2 == 0,
+            create_date=datetime(2010, 10, 10 + number),
+        )
+        for number in range(5)
+    ]
+
+
+@pytest.mark.usefixtures("five_projects")
+def test_projects_keyset_pagination(user_client):
+    response = user_client.get(PROJECTS_URL, params={"limit": 2})
+    assert [project["id"] for project in response.json()] == [1, 2], (
+        f"GET-запрос к `{PROJECTS_URL}` с параметром `limit` должен "
+        "возвращать первую страницу проектов по возрастанию id."
+    )
+    assert 'rel="next"' in response.headers["link"], (
+        "Для неполного списка в ответе должен быть заголовок `Link` "
+        "на следующую страницу."
+    )
+    ids = [project["id"] for project in response.json()]
+    while "link" in response.headers:
+        next_url = response.headers["link"].split(">")[0].lstrip("<")
+        response = user_client.get(next_url)
+        ids.extend(project["id"] for project in response.json())
+    assert ids == [1, 2, 3, 4, 5], (
+        "Переход по заголовкам `Link` должен возвращать все проекты "
+        "без пропусков и повторов."
+    )
+
+
+@pytest.mark.usefixtures("five_projects")
+def test_projects_filters(user_client):
+    response = user_client.get(
+        PROJECTS_URL,
+        params={"fully_invested": False, "created_from": "2010-10-12T00:00:00"},
+    )
+    assert [project["id"] for project in response.json()] == [4], (
+        "Фильтры `fully_invested` и `created_from` должны "
+        "применяться вместе."
+    )
+    assert "link" not in response.headers
+
+
+@pytest.mark.usefixtures("donation", "another_donation")
+def test_donations_filter_by_user(superuser_client):
+    response = superuser_client.get(DONATIONS_URL, params={"user_id": 1})
+    assert [donation["user_id"] for donation in response.json()] == [1], (
+        f"GET-запрос к `{DONATIONS_URL}` с параметром `user_id` должен "
+        "возвращать только пожертвования этого пользователя."
+    )
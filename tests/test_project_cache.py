@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.cache import MemoryCache, set_cache
+from app.core.config import settings
+
+
+PROJECTS_URL = "/charity_project/"
+DONATION_URL = "/donation/"
+
+
+@pytest.fixture(autouse=True)
+def memory_cache():
+    cache = MemoryCache()
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+@pytest.fixture
+def project_cache(monkeypatch):
+    monkeypatch.setattr(settings, "project_list_cache_enabled", True)
+
+
+@pytest.mark.usefixtures("charity_project")
+def test_cached_list_matches_uncached(user_client, monkeypatch):
+    uncached = user_client.get(PROJECTS_URL)
+    monkeypatch.setattr(settings, "project_list_cache_enabled", True)
+    cached = user_client.get(PROJECTS_URL)
+    assert cached.json() == uncached.json(), (
+        "Список проектов из кэша должен совпадать с ответом без кэша."
+    )
+    assert "etag" in cached.headers
+
+
+@pytest.mark.usefixtures("project_cache", "charity_project")
+def test_cached_list_not_modified(user_client):
+    etag = user_client.get(PROJECTS_URL).headers["etag"]
+    response = user_client.get(
+        PROJECTS_URL, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304, (
+        "При совпадении `If-None-Match` с ETag списка проектов "
+        "должен возвращаться статус-код 304."
+    )
+
+
+@pytest.mark.usefixtures("project_cache", "charity_project")
+def test_cached_list_invalidated_by_investment(user_client):
+    response = user_client.get(PROJECTS_URL)
+    assert response.json()[0]["invested_amount"] == 0
+    user_client.post(DONATION_URL, json={"full_amount": 100})
+    response = user_client.get(
+        PROJECTS_URL, headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["invested_amount"] == 100, (
+        "Пожертвование, вложенное в проект, должно сбрасывать "
+        "кэш списка проектов."
+    )
+
+
+@pytest.mark.usefixtures("project_cache", "charity_project")
+def test_cached_list_key_ignores_query_form(user_client, memory_cache):
+    for query in ("", "?limit=100", "?x=1", "?x=2", "?x=1&limit=100"):
+        assert user_client.get(PROJECTS_URL + query).status_code == 200
+    assert len(memory_cache) == 1, (
+        "Равнозначные запросы списка проектов должны использовать одну "
+        "запись кэша."
+    )
+    link = user_client.get(PROJECTS_URL + "?x=1&limit=1").headers["link"]
+    assert "x=1" not in link, (
+        "Ссылка на следующую страницу из кэша не должна содержать "
+        "посторонние параметры запроса."
+    )
@@ -0,0 +1,64 @@
+import csv
+import io
+from datetime import datetime
+
+import pytest
+from fixtures.jobs import wait_for_job
+
+
+FASTEST_URL = "/charity_project/reports/fastest"
+EXPORT_URL = FASTEST_URL + "/export"
+
+
+@pytest.fixture
+def closed_projects(mixer):
+    return [
+        mixer.blend(
+            "app.models.charity_project.CharityProject",
+            name=f"project {days}",
+            description="description",
+            full_amount=100,
+            invested_amount=100 if closed else 0,
+            fully_invested=closed,
+            create_date=datetime(2020, 1, 1),
+            close_date=datetime(2020, 1, 1 + days) if closed else None,
+        )
+        for days, closed in ((5, True), (1, True), (3, False), (2, True))
+    ]
+
+
+@pytest.mark.usefixtures("closed_projects")
+def test_fastest_projects(user_client):
+    response = user_client.get(FASTEST_URL, params={"limit": 2})
+    assert response.status_code == 200
+    assert [
+        (project["name"], project["fill_seconds"])
+        for project in response.json()
+    ] == [("project 1", 86400.0), ("project 2", 172800.0)], (
+        f"`{FASTEST_URL}` должен возвращать закрытые проекты по "
+        "возрастанию времени наполнения."
+    )
+
+
+@pytest.mark.usefixtures("closed_projects")
+def test_fastest_projects_export_job(superuser_client, job_files):
+    response = superuser_client.post(EXPORT_URL)
+    assert response.status_code == 202
+    job = wait_for_job(superuser_client, response.json()["id"])
+    assert job["status"] == "done", job
+    assert job["progress"] == 100
+
+    response = superuser_client.get(f"/jobs/{job['id']}/file")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == [
+        "project 1",
+        "project 2",
+        "project 5",
+    ]
+    assert (job_files / job["result"]).exists()
+
+
+def test_export_forbidden_for_user(user_client):
+    response = user_client.post(EXPORT_URL)
+    assert response.status_code == 403
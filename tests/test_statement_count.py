@@ -0,0 +1,58 @@
+from conftest import engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.models import CharityProject, Donation, FundStats
+from app.services.invested import invest
+
+
+AppSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def recorded_statements(target):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, many):
+        statements.append(statement.split(None, 1)[0])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with AppSessionLocal() as session:
+            await invest(target, session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def test_donation_without_projects_skips_refresh():
+    async with AppSessionLocal() as session:
+        session.add(FundStats(id=1))
+        await session.commit()
+
+    donation = Donation(full_amount=10)
+    statements = await recorded_statements(donation)
+
+    assert statements == ["INSERT", "SELECT", "UPDATE"], (
+        "Пожертвование без открытых проектов должно записываться без "
+        f"перечитывания после коммита, запросы: {statements}"
+    )
+    assert donation.id == 1
+    assert donation.create_date is not None
+    assert donation.version_id == 1
+
+
+async def test_invested_project_values_available_after_commit():
+    async with AppSessionLocal() as session:
+        session.add(Donation(full_amount=30))
+        await session.commit()
+
+    project = CharityProject(name="a", description="a", full_amount=20)
+    statements = await recorded_statements(project)
+
+    assert statements[-1] != "SELECT"
+    assert project.fully_invested
+    assert project.close_date is not None
+    assert project.version_id == 2
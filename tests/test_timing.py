@@ -0,0 +1,43 @@
+import logging
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.core.timing import statements_histogram
+
+
+def server_timing_statements(response):
+    header = response.headers["server-timing"]
+    return int(re.search(r'db;desc="(\d+) SQL"', header).group(1))
+
+
+@pytest.mark.usefixtures("charity_project")
+def test_server_timing_header(user_client):
+    response = user_client.get("/charity_project/")
+    assert response.status_code == 200
+    assert server_timing_statements(response) == 1, (
+        "Заголовок Server-Timing должен содержать число SQL-запросов."
+    )
+    assert "db-slowest;dur=" in response.headers["server-timing"]
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+def test_statements_histogram_by_route(user_client):
+    statements_histogram.clear()
+    for _ in range(2):
+        user_client.get("/charity_project/")
+    user_client.get("/unknown")
+
+    series = statements_histogram.series[("GET", "/charity_project/")]
+    assert series.count == 2
+    assert series.sum == 2
+    assert ("GET", "unmatched") in statements_histogram.series
+
+
+def test_slow_query_logged(user_client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.timing"):
+        user_client.get("/charity_project/")
+    assert "Медленный SQL-запрос" in caplog.text
+    assert "FROM charityproject" in caplog.text
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+
+from app.core.cache import MemoryCache, set_cache
+from app.core.config import settings
+
+
+USER = {"email": "dead@pool.com", "password": "chimichangas4life"}
+
+
+@pytest.fixture(autouse=True)
+def user_cache(monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_enabled", True)
+    set_cache(MemoryCache())
+    yield
+    set_cache(None)
+
+
+@pytest.fixture
+def auth_headers(auth_client):
+    auth_client.post("/auth/register", json=USER)
+    response = auth_client.post(
+        "/auth/jwt/login",
+        data={"username": USER["email"], "password": USER["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def sql_statements(response) -> int:
+    return int(
+        re.search(r'db;desc="(\d+) SQL"', response.headers["server-timing"])
+        .group(1)
+    )
+
+
+def test_cached_user_skips_select(auth_client, auth_headers):
+    first = auth_client.get("/donation/my", headers=auth_headers)
+    second = auth_client.get("/donation/my", headers=auth_headers)
+    assert first.status_code == second.status_code == 200
+    assert sql_statements(second) == sql_statements(first) - 1, (
+        "Пользователь из кэша не должен читаться из БД повторно."
+    )
+
+
+def test_donation_with_cached_user(auth_client, auth_headers):
+    auth_client.get("/donation/my", headers=auth_headers)
+    response = auth_client.post(
+        "/donation/", headers=auth_headers, json={"full_amount": 100}
+    )
+    assert response.status_code == 200
+    response = auth_client.get("/donation/my", headers=auth_headers)
+    assert [donation["full_amount"] for donation in response.json()] == [100]
+
+
+def test_cached_user_invalidated_by_update(auth_client, auth_headers):
+    auth_client.get("/users/me", headers=auth_headers)
+    response = auth_client.patch(
+        "/users/me", headers=auth_headers, json={"email": "new@pool.com"}
+    )
+    assert response.status_code == 200
+    response = auth_client.get("/users/me", headers=auth_headers)
+    assert response.json()["email"] == "new@pool.com", (
+        "После изменения пользователя кэш должен сбрасываться."
+    )
+
+
+def test_invalid_token_rejected(auth_client, auth_headers):
+    response = auth_client.get(
+        "/donation/my", headers={"Authorization": "Bearer broken"}
+    )
+    assert response.status_code == 401